@@ -0,0 +1,156 @@
+# agreements.py
+# 협력 단계의 양자 합의 인덱스
+# 모든 제안(팀 -> 파트너 -> 협력 파라미터)을 (팀 x 팀 x 파라미터) 정수 코드 배열 하나에 둡니다.
+# 한 팀이 저장하면 그 팀의 행과 그 팀이 낀 쌍의 일치 여부만 다시 계산합니다.
+import threading
+
+import numpy as np
+
+import config
+import instrument
+import store
+
+PARAMS = list(config.coop_params)
+POINTS = np.array([config.coop_params[k]["points"] for k in PARAMS])
+NO_POINTS = ("None", "No", "", None)   # utils.coop_points_used와 같은 기준
+
+
+def _default_value(meta):
+    return "No" if meta["type"] == "bool" else "None"
+
+
+class AgreementIndex:
+    """
+    인덱스는 세션끼리 공유되므로 set_offers와 읽기 메서드는 모두 self.lock을 잡습니다
+    (다른 세션이 다시 불러오는 중인 반쯤 바뀐 행을 읽지 않도록).
+    """
+
+    def __init__(self, teams):
+        self.lock = threading.RLock()
+        self.teams = list(teams)
+        self.pos = {t: i for i, t in enumerate(self.teams)}
+        # 파라미터별 값 사전: code -> 문자열. 처음 보는 값은 뒤에 추가됩니다.
+        self.vocab = [["No", "Yes"] if config.coop_params[k]["type"] == "bool" else list(config.coop_params[k]["options"])
+                      for k in PARAMS]
+        self.codes = [{v: c for c, v in enumerate(values)} for values in self.vocab]
+        self.costly = [[v not in NO_POINTS for v in values] for values in self.vocab]
+
+        n, k = len(self.teams), len(PARAMS)
+        defaults = [self._encode(j, _default_value(config.coop_params[p])) for j, p in enumerate(PARAMS)]
+        self.offers = np.tile(np.array(defaults, dtype=np.int16), (n, n, 1))   # [팀, 파트너, 파라미터]
+        self.paid = np.zeros((n, n, k), dtype=bool)                            # 포인트가 드는 제안
+        self.saved = np.zeros(n, dtype=bool)
+        self.mismatch = np.zeros((n, n, k), dtype=bool)                        # offers[a, b] != offers[b, a]
+        self.used = np.zeros((n, n), dtype=np.int64)                           # (팀, 파트너)별 포인트
+        self.row_version = np.zeros(n, dtype=np.int64)
+        self._matrix_cache = {}   # 팀 -> (행 버전, 열)
+
+    def _encode(self, j, value):
+        code = self.codes[j].get(value)
+        if code is None:
+            code = len(self.vocab[j])
+            self.vocab[j].append(value)
+            self.codes[j][value] = code
+            self.costly[j].append(value not in NO_POINTS)
+        return code
+
+    def set_offers(self, team, offers: dict):
+        """한 팀의 제안 ({파트너: {파라미터: 값}})을 바꾸고 그 팀이 낀 쌍을 갱신합니다."""
+        a = self.pos[team]
+        with self.lock:
+            for partner, b in self.pos.items():
+                if partner == team:
+                    continue
+                row = offers.get(partner, {})
+                for j, param in enumerate(PARAMS):
+                    value = row.get(param, "None")
+                    code = self._encode(j, value)
+                    self.offers[a, b, j] = code
+                    self.paid[a, b, j] = self.costly[j][code]
+            self.saved[a] = True
+            self.used[a] = self.paid[a] @ POINTS
+            self.mismatch[a] = self.offers[a] != self.offers[:, a]
+            self.mismatch[:, a] = self.mismatch[a]
+            self.row_version[a] += 1
+
+    def offers_of(self, team) -> dict:
+        """한 팀의 제안을 {파트너: {파라미터: 값}}으로 되돌립니다."""
+        a = self.pos[team]
+        with self.lock:
+            return {p: {k: self.vocab[j][self.offers[a, b, j]] for j, k in enumerate(PARAMS)}
+                    for p, b in self.pos.items() if p != team}
+
+    def points_used(self, team) -> tuple:
+        a = self.pos[team]
+        with self.lock:
+            per_partner = {p: int(self.used[a, b]) for p, b in self.pos.items() if p != team}
+            return int(self.used[a].sum()), per_partner
+
+    def is_saved(self, team) -> bool:
+        with self.lock:
+            return bool(self.saved[self.pos[team]])
+
+    def mismatches(self, team, partner) -> list:
+        a, b = self.pos[team], self.pos[partner]
+        with self.lock:
+            return [PARAMS[j] for j in np.flatnonzero(self.mismatch[a, b])]
+
+    def matrix(self, team) -> dict:
+        """team의 Cooperation Matrix 열 (예전 compute_matrix와 같은 칸). 그 팀이 다시 저장할 때까지 캐시합니다."""
+        a = self.pos[team]
+        with self.lock:
+            version = int(self.row_version[a])
+            cached = self._matrix_cache.get(team)
+            if cached is not None and cached[0] == version:
+                instrument.count("cache.agreement_matrix.hit")
+                return cached[1]
+            instrument.count("cache.agreement_matrix.miss")
+            partners = [p for p in self.teams if p != team]
+            total, per_partner = self.points_used(team)
+            columns = {
+                "Parameter": PARAMS + ["Used Points"],
+                "Points": [str(p) for p in POINTS] + [str(total)],
+            }
+            for p in partners:
+                b = self.pos[p]
+                values = [self.vocab[j][self.offers[a, b, j]] for j in range(len(PARAMS))]
+                columns[p] = [str(v if v != "None" else "No") for v in values] + [str(per_partner[p])]
+            self._matrix_cache[team] = (version, columns)
+            return columns
+
+
+# (game, round) -> [store.team_versions, AgreementIndex]. 모든 세션이 공유합니다.
+# 새 라운드의 인덱스를 만들 때 그 게임의 지난 라운드 인덱스는 지웁니다.
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def agreement_index(game=store.DEFAULT_GAME, round=None) -> AgreementIndex:
+    """그 라운드의 인덱스. 지난 호출 이후 버전이 바뀐 팀의 협력 행만 다시 불러옵니다."""
+    round = store.current_round(game) if round is None else round
+    versions = store.team_versions(game, round)
+    with _indexes_lock:
+        entry = _indexes.get((game, round))
+        if entry is None:
+            for key in [k for k in _indexes if k[0] == game and k[1] < round]:
+                del _indexes[key]
+            index = AgreementIndex(config.team_credentials)
+            for team, offers in store.load_all_cooperation(game, round).items():
+                if team in index.pos:
+                    index.set_offers(team, offers)
+            entry = _indexes[(game, round)] = [dict(versions), index]
+        seen, index = entry
+        for team, version in versions.items():
+            if team in index.pos and seen.get(team) != version:
+                instrument.count("cache.agreements.reload")
+                offers = store.load_cooperation(team, game, round)
+                if offers is not None:
+                    index.set_offers(team, offers)
+                seen[team] = version
+        return index
+
+
+def save_offers(team, offers: dict, game=store.DEFAULT_GAME) -> AgreementIndex:
+    """한 팀의 제안을 저장하고 갱신된 인덱스를 반환합니다."""
+    store.save_cooperation(team, offers, game)
+    return agreement_index(game)
@@ -0,0 +1,231 @@
+# benchmarks/hotpaths.py
+# 점수 계산 핫패스와 페이지 렌더링 시간 측정
+# --seed로 만든 한 라운드의 shared_data JSON 파일(임시 디렉터리)을 store.py가 새 DB로 가져와서 씁니다.
+#   python benchmarks/hotpaths.py                        # 표 출력
+#   python benchmarks/hotpaths.py --json out.json        # 결과도 저장
+#   python benchmarks/hotpaths.py --baseline out.json    # 느려진 항목이 있으면 exit 1
+#   python benchmarks/hotpaths.py --fixture fixture_dir  # 만든 shared_data를 남김
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY_SIZES = (10, 100, 1000)
+PAGES = ["1_Login", "2_Policy", "3_Cooperation", "4_Events", "5_Summary"]
+
+
+# --- 픽스처 ---
+
+def write_fixture(directory: Path, seed: int):
+    """seed로 모든 팀의 한 라운드 shared_data 파일을 만듭니다."""
+    import config
+    import engine
+    import simulate
+
+    rng = random.Random(seed)
+    teams = list(config.team_credentials)
+    decisions = simulate.sample_decisions(rng, teams)
+    shared = directory / "shared_data"
+    shared.mkdir(parents=True, exist_ok=True)
+    for old in shared.glob("game.sqlite3*"):   # 이전 실행의 DB가 아니라 파일에서 시작
+        old.unlink()
+    for team in teams:
+        files = {
+            "hidden": engine.build_hidden(team, decisions[team].policy),
+            "cooperation": decisions[team].cooperation,
+            "domestic": config.domestic_events[engine.draw_domestic_event(rng)],
+        }
+        for prefix, data in files.items():
+            (shared / f"{prefix}_{team}.json").write_text(json.dumps(data, ensure_ascii=False))
+    events = [config.international_events[i] for i in engine.draw_international_events(rng)]
+    (shared / "international.json").write_text(json.dumps(events, ensure_ascii=False))
+
+
+# --- 시간 측정 ---
+
+def timed(fn, min_time=0.2, repeat=5) -> dict:
+    """호출당 중앙값 / 최솟값 (마이크로초). min_time초 이상인 묶음을 repeat번."""
+    fn()  # 워밍업
+    n = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        if time.perf_counter() - start >= min_time / repeat or n >= 1 << 20:
+            break
+        n *= 2
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        per_call.append((time.perf_counter() - start) / n * 1e6)
+    return {"median_us": round(statistics.median(per_call), 2), "min_us": round(min(per_call), 2), "calls": n}
+
+
+# --- 벤치마크 ---
+
+def scoring_benchmarks() -> dict:
+    import numpy as np
+    import config
+    import utils
+
+    teams = list(config.team_credentials)
+    inputs = {team: utils.load_round_inputs(team) for team in teams}
+    events = utils.load_international_events()
+    initial = {name: dict(v) for name, v in config.initial_data.items()}
+    growth = {team: utils.compute_growth_rate(inputs[team][0], config.fixed_values[team]) for team in teams}
+    hidden, coop, _ = inputs[teams[0]]
+    domestic = list(config.domestic_events.values())
+    papers = np.linspace(0, 5000, 10000)
+
+    def evaluate_delta():
+        for event in domestic:
+            utils.evaluate_delta(event["delta_papers"], hidden)
+            utils.evaluate_delta(event["delta_models"], hidden)
+
+    def evaluate_event_international():
+        for event in config.international_events:
+            utils.evaluate_event_international(event["delta_papers"], hidden, coop)
+            utils.evaluate_event_international(event["delta_models"], hidden, coop)
+
+    import outcomes
+    import projection
+    projector = projection.projector(teams[0])
+    sliders = {p: hidden[p] for p in utils.POLICY_PARAMS}
+    previous = projector.project(sliders, initial[teams[0]], 5)
+    moved = {**sliders, "Semiconductor": (sliders["Semiconductor"] + 1) % 11}
+
+    def projection_cold():
+        outcomes._event_cache.clear()
+        projector.project(sliders, initial[teams[0]], 5)
+
+    def evaluate_international(events, reps, batch):
+        # 팀을 reps배로 복제한 (팀 × 파트너) 격자에서 스칼라/벡터 경로를 각각 강제로 측정
+        hidden_by_team = {f"{t}{i}": inputs[t][0] for i in range(reps) for t in teams}
+        coop_by_team = {f"{t}{i}": inputs[t][1] for i in range(reps) for t in teams}
+        threshold = utils.BATCH_MIN_EVALUATIONS
+        def run():
+            utils.BATCH_MIN_EVALUATIONS = 0 if batch else float("inf")
+            try:
+                utils.evaluate_international_batch(events, hidden_by_team, coop_by_team)
+            finally:
+                utils.BATCH_MIN_EVALUATIONS = threshold
+        return timed(run)
+
+    international_sizes = {}
+    for label, chosen in (("2 events", events), ("45 events", config.international_events)):
+        for reps in (1, 4):
+            cells = reps * len(teams) * len(utils.international_partners({t: inputs[t][1] for t in teams}, teams))
+            for path in ("scalar", "batch"):
+                international_sizes[f"evaluate_international[{label}, {cells} cells, {path}]"] = \
+                    evaluate_international(chosen, reps, path == "batch")
+
+    def round_results_cold():
+        utils._round_results_cache.clear()
+        utils.calculate_all_round_results(initial, growth)
+
+    return {
+        f"evaluate_delta[{2 * len(domestic)} formulas]": timed(evaluate_delta),
+        f"evaluate_event_international[{2 * len(config.international_events) * len(coop)} formulas]":
+            timed(evaluate_event_international),
+        **international_sizes,
+        "score_all_teams": timed(lambda: utils.score_all_teams(inputs, events, initial, growth)),
+        "calculate_all_round_results[cold]": timed(round_results_cold),
+        "calculate_all_round_results[cached]": timed(lambda: utils.calculate_all_round_results(initial, growth)),
+        "projection.project[cold]": timed(projection_cold),
+        "projection.project[one slider moved]": timed(lambda: projector.project(moved, initial[teams[0]], 5, previous)),
+        "compute_growth_rate": timed(lambda: utils.compute_growth_rate(hidden, config.fixed_values[teams[0]])),
+        "calculate_ai_models[scalar]": timed(lambda: utils.calculate_ai_models(1234.0)),
+        "calculate_ai_models[array 10000]": timed(lambda: utils.calculate_ai_models(papers)),
+    }
+
+
+def history_benchmarks() -> dict:
+    import config
+    import store
+    import utils
+
+    scores = {name: dict(v) for name, v in config.initial_data.items()}
+    results = {}
+    for size in HISTORY_SIZES:
+        game = f"bench-history-{size}"
+        store.create_game(game)
+        for r in range(1, size + 1):
+            store.save_history({"round": r, "scores": scores}, game)
+        results[f"load_history[{size} rounds]"] = timed(lambda: utils.load_history(game), min_time=0.05)
+        results[f"initial_scores_for[{size} rounds]"] = timed(lambda: utils.initial_scores_for(size + 1, game), min_time=0.05)
+        # 마지막에 측정: 저장할 때마다 기록이 한 라운드씩 늘어납니다.
+        next_round = iter(range(size + 1, 1 << 30))
+        results[f"save_history[{size} rounds]"] = timed(
+            lambda: utils.save_history({"round": next(next_round), "scores": scores}, game), min_time=0.05)
+    return results
+
+
+def page_benchmarks() -> dict:
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")  # AppTest bare mode 경고 숨김
+    from streamlit.testing.v1 import AppTest
+    import store
+
+    results = {}
+    for page in PAGES:
+        def render():
+            at = AppTest.from_file(str(ROOT / "pages" / f"{page}.py"), default_timeout=60)
+            at.session_state["authenticated_team"] = "Korea"
+            at.session_state["game_id"] = store.DEFAULT_GAME
+            at.session_state["growth_rate"] = 30
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"{page}: {at.exception[0].value}")
+        results[f"render[{page}]"] = timed(render, min_time=0.5, repeat=3)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timings for the scoring hot paths and headless page renders.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixture", help="directory for the generated shared_data (default: a temporary one)")
+    parser.add_argument("--skip-pages", action="store_true", help="skip the AppTest page renders")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown vs. baseline")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else {}
+    json_out = Path(args.json).resolve() if args.json else None
+    workdir = Path(args.fixture or tempfile.mkdtemp(prefix="srt-bench-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    # config.shared_dir는 작업 디렉터리 기준이므로 import 전에 픽스처를 준비해야 합니다.
+    os.chdir(workdir)
+    sys.path.insert(0, str(ROOT))
+    import logging
+    logging.basicConfig(level=logging.ERROR)  # 거부된 수식 경고는 여기서 불필요
+    write_fixture(workdir, args.seed)
+
+    results = {**scoring_benchmarks(), **history_benchmarks()}
+    if not args.skip_pages:
+        results.update(page_benchmarks())
+
+    failed = False
+    print(f"{'benchmark':<52} {'median':>12}  status")
+    for name, r in results.items():
+        status = "ok"
+        if name in baseline and r["median_us"] > baseline[name]["median_us"] * args.tolerance:
+            status = f"slower than baseline ({baseline[name]['median_us']} us)"
+            failed = True
+        print(f"{name:<52} {r['median_us']:>10.1f}us  {status}")
+    print(f"fixture: {workdir / 'shared_data'}")
+
+    if json_out:
+        json_out.write_text(json.dumps(results, indent=4))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/startup.py
+# 콜드 스타트 import 시간 예산: 모듈마다 새 인터프리터에서 (새 Streamlit 워커처럼) import 시간을 재고,
+# 나중에 불러와야 할 무거운 의존성을 import하면 실패로 봅니다.
+#   python benchmarks/startup.py                   # 표 출력, 예산 초과면 exit 1
+#   python benchmarks/startup.py --json out.json   # 결과도 저장
+#   python benchmarks/startup.py --baseline out.json
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 새 인터프리터에서 잰 import 시간 중앙값 (ms)
+BUDGET_MS = {
+    "config": 20,
+    "formulas": 250,
+    "utils": 300,
+}
+
+# 키 모듈을 import할 때 함께 import되면 안 되는 모듈
+FORBIDDEN = {
+    "config": ["numpy", "scipy", "pandas", "plotly", "streamlit"],
+    "formulas": ["scipy", "pandas", "plotly", "streamlit"],
+    "utils": ["scipy", "pandas", "plotly", "streamlit"],
+}
+
+# import 뒤에 실행해 보는 평소 경로 (여기서 늦게 import하는 것도 FORBIDDEN 위반으로 봅니다)
+EXERCISE = {
+    "utils": "import numpy as np; utils.calculate_ai_models(np.array([100, 200])); utils.finish_round(0, 0, 0, 0, 100, 0, 10)",
+}
+
+_PROBE = """
+import sys, time, json
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+loaded = sorted(m for m in {forbidden!r} if m in sys.modules)
+{exercise}
+used = sorted(m for m in {forbidden!r} if m in sys.modules and m not in loaded)
+print(json.dumps({{"ms": elapsed * 1000, "loaded": loaded, "used": used}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    runs, loaded, used = [], [], []
+    for _ in range(repeat):
+        probe = _PROBE.format(module=module, forbidden=FORBIDDEN.get(module, []), exercise=EXERCISE.get(module, ""))
+        out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        runs.append(result["ms"])
+        loaded, used = result["loaded"], result["used"]
+    return {
+        "median_ms": round(statistics.median(runs), 2),
+        "min_ms": round(min(runs), 2),
+        "budget_ms": BUDGET_MS[module],
+        "forbidden_loaded": loaded,
+        "forbidden_used": used,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import budget.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown vs. baseline")
+    args = parser.parse_args()
+
+    results = {module: measure(module, args.repeat) for module in BUDGET_MS}
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else {}
+
+    failed = False
+    print(f"{'module':<10} {'median':>9} {'budget':>8}  status")
+    for module, r in results.items():
+        problems = []
+        if r["median_ms"] > r["budget_ms"]:
+            problems.append("over budget")
+        if r["forbidden_loaded"]:
+            problems.append("imports " + ", ".join(r["forbidden_loaded"]))
+        if r["forbidden_used"]:
+            problems.append("loads " + ", ".join(r["forbidden_used"]) + " when used")
+        if module in baseline and r["median_ms"] > baseline[module]["median_ms"] * args.tolerance:
+            problems.append(f"slower than baseline ({baseline[module]['median_ms']} ms)")
+        failed |= bool(problems)
+        print(f"{module:<10} {r['median_ms']:>7.1f}ms {r['budget_ms']:>6}ms  {'; '.join(problems) or 'ok'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=4))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# charts.py
+# Summary 페이지의 누적 성장 그래프 데이터
+# 게임마다 기록된 라운드를 NumPy 배열로 들고 있다가 새로 기록된 라운드만 덧붙입니다.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import config
+import instrument
+import store
+
+SUPERPOWER_COLUMNS = ["United States", "China"]
+PLAYER_SUM = f"{len(config.team_credentials)} Players Sum"
+# 범례 순서: 미국, 중국, 플레이어 합계, 플레이어 팀 (config.team_credentials 순서)
+COLUMNS = SUPERPOWER_COLUMNS + [PLAYER_SUM] + list(config.team_credentials)
+METRICS = ("models", "papers")
+
+
+def score_row(scores: dict) -> np.ndarray:
+    """{국가: {'papers', 'models'}} -> (len(METRICS), len(COLUMNS)) 배열."""
+    row = np.zeros((len(METRICS), len(COLUMNS)))
+    for m, metric in enumerate(METRICS):
+        for c, name in enumerate(COLUMNS):
+            if name != PLAYER_SUM:
+                row[m, c] = scores.get(name, {}).get(metric, 0)
+        row[m, COLUMNS.index(PLAYER_SUM)] = sum(scores.get(t, {}).get(metric, 0) for t in config.team_credentials)
+    return row
+
+
+class GrowthSeries:
+    """한 게임의 라운드 번호와 점수 행 (라운드 0 = config.initial_data부터)."""
+
+    def __init__(self):
+        self.rounds = np.zeros(16, dtype=np.int64)
+        self.values = np.zeros((16, len(METRICS), len(COLUMNS)))
+        self.size = 1
+        self.values[0] = score_row(config.initial_data)
+
+    @property
+    def last_round(self) -> int:
+        return int(self.rounds[self.size - 1])
+
+    def append(self, round_num: int, scores: dict):
+        if self.size == len(self.rounds):   # 용량을 두 배로 늘려 append를 상수 시간으로 유지
+            self.rounds = np.resize(self.rounds, 2 * self.size)
+            self.values = np.resize(self.values, (2 * self.size, len(METRICS), len(COLUMNS)))
+        self.rounds[self.size] = round_num
+        self.values[self.size] = score_row(scores)
+        self.size += 1
+
+    def upto(self, round_num: int):
+        """round_num 이전에 기록된 모든 라운드의 (rounds, values)."""
+        n = int(np.searchsorted(self.rounds[:self.size], round_num))
+        return self.rounds[:n], self.values[:n]
+
+
+# game -> GrowthSeries (프로세스 전체에서 공유). 최근에 쓴 MAX_GAMES개 게임만 들고 있습니다.
+_series = OrderedDict()
+_series_lock = threading.Lock()
+MAX_GAMES = 16
+
+
+def growth_series(game=store.DEFAULT_GAME) -> GrowthSeries:
+    """그 게임의 시리즈. 지난 호출 이후 기록된 라운드만 덧붙입니다."""
+    with _series_lock:
+        series = _series.setdefault(game, GrowthSeries())
+        _series.move_to_end(game)
+        while len(_series) > MAX_GAMES:
+            _series.popitem(last=False)
+        for d in store.history_range(series.last_round + 1, 2 ** 62, game):
+            series.append(d['round'], d['scores'])
+            instrument.count("charts.rounds_appended")
+        return series
+
+
+def growth_figure(series: GrowthSeries, current_round_num: int, current_scores: dict, metric: str, yaxis_title: str):
+    """현재 라운드 이전의 모든 기록과 현재 점수로 metric의 꺾은선 그래프를 그립니다 (plotly는 여기서 import)."""
+    import plotly.graph_objects as go
+
+    rounds, values = series.upto(current_round_num)
+    x = np.append(rounds, current_round_num)
+    y = np.concatenate([values[:, METRICS.index(metric)], score_row(current_scores)[None, METRICS.index(metric)]])
+
+    # Plotly 그래프 생성
+    fig = go.Figure()
+    for c, country in enumerate(COLUMNS):
+        fig.add_trace(go.Scatter(x=x, y=y[:, c], mode='lines+markers', name=country))
+
+    # X축 범위와 틱(tick) 설정
+    fig.update_layout(
+        xaxis=dict(
+            title="Round",
+            range=[0, current_round_num + 2],  # 현재 라운드 + 2 만큼 여유 공간
+            tickmode='linear',
+            tick0=0,
+            dtick=1  # 1단위로 정수 틱만 표시
+        ),
+        yaxis_title=yaxis_title,
+        legend_title="Country"
+    )
+    return fig
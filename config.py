@@ -1,8 +1,9 @@
 from pathlib import Path
 
 # Data Directory
-shared_dir = Path("shared_data")
-shared_dir.mkdir(exist_ok=True)
+shared_dir = Path("shared_data")   # 처음 쓸 때 store.connect가 만듭니다
+# 모든 팀이 공유하는 게임 상태 (store.py)
+db_path = shared_dir / "game.sqlite3"
 
 # Configuration and Static Setup
 team_credentials = {
@@ -0,0 +1,241 @@
+# engine.py
+# Streamlit과 공유 파일 없이 한 라운드의 모든 단계를 메모리에서 진행하는 엔진 (시뮬레이션용)
+# 페이지와 같은 함수를 쓰므로 점수는 실제 게임과 같습니다.
+import copy
+import random
+from dataclasses import dataclass, field
+
+import config
+import utils
+
+PLAYER_TEAMS = list(config.team_credentials)
+SUPERPOWERS = ("United States", "China")
+# 라운드당 미국/중국 논문 증가량 범위
+SUPERPOWER_PAPER_GROWTH = {"United States": (150, 250), "China": (200, 300)}
+INTERNATIONAL_EVENTS_PER_ROUND = 2
+MAX_ADJUSTMENT = 5
+
+
+@dataclass
+class TeamDecision:
+    policy: dict                                      # 슬라이더 값 (Alignment_China = 10 - Alignment_US)
+    cooperation: dict = field(default_factory=dict)   # 파트너 -> {협력 파라미터: "Yes"/"No"/옵션}
+    adjustment: tuple = None                          # 최종 정책 조정 (파라미터, 새 값)
+
+
+@dataclass
+class GameState:
+    round: int = 1
+    scores: dict = field(default_factory=lambda: copy.deepcopy(config.initial_data))
+    history: list = field(default_factory=list)       # store.py의 history와 같은 항목
+
+
+@dataclass
+class RoundReport:
+    round: int
+    hidden: dict                # 팀 -> 조정 후 hidden 파라미터
+    growth: dict                # 팀 -> 논문 성장률
+    cooperation: dict           # 팀 -> 성립된 협력 (양쪽이 같은 값을 낸 것만)
+    domestic_events: dict       # 팀 -> config.domestic_events 키
+    intel: dict                 # 팀 -> 정보 문자열 리스트
+    international_events: list  # config.international_events 인덱스
+    results: dict               # Summary 페이지의 all_results와 같은 형태
+
+
+# --- 1. 정책 ---
+
+def build_hidden(team: str, policy: dict) -> dict:
+    """슬라이더 값을 검사하고 hidden 파라미터 전체 (슬라이더 + 고정값)를 반환합니다."""
+    hidden = {p: policy.get(p, 0) for p in utils.POLICY_PARAMS}
+    hidden["Alignment_China"] = 10 - hidden["Alignment_US"]
+    for p, v in hidden.items():
+        if not 0 <= v <= 10:
+            raise ValueError(f"{team}: {p}={v} is outside 0..10")
+    used = utils.policy_points(hidden)
+    if used > utils.POLICY_BUDGET:
+        raise ValueError(f"{team}: policy uses {used} points, budget is {utils.POLICY_BUDGET}")
+    return {**hidden, **config.fixed_values[team]}
+
+
+def growth_rate(team: str, hidden: dict) -> int:
+    return utils.compute_growth_rate(hidden, config.fixed_values[team])
+
+
+# --- 2. 협력 ---
+
+def default_cooperation() -> dict:
+    return {k: "No" if v["type"] == "bool" else "None" for k, v in config.coop_params.items()}
+
+
+def settle_cooperation(offers: dict, hidden: dict) -> dict:
+    """
+    offers: 팀 -> 파트너 -> {파라미터: 값}. 팀마다 20 + Willing_to_Cooperate 한도 안이어야 합니다.
+    양쪽이 같은 값을 낸 파라미터만 성립하고 나머지는 "No"/"None"입니다.
+    """
+    teams = list(offers)
+    for team in teams:
+        partners = [p for p in teams if p != team]
+        used, _ = utils.coop_points_used(offers[team], partners)
+        limit = utils.coop_limit(hidden[team])
+        if used > limit:
+            raise ValueError(f"{team}: cooperation uses {used} points, limit is {limit}")
+
+    default = default_cooperation()
+    settled = {}
+    for team in teams:
+        settled[team] = {}
+        for partner in teams:
+            if partner == team:
+                continue
+            mine = {**default, **offers[team].get(partner, {})}
+            theirs = {**default, **offers[partner].get(team, {})}
+            settled[team][partner] = {
+                k: mine[k] if mine[k] == theirs[k] else default[k] for k in config.coop_params
+            }
+    return settled
+
+
+# --- 3. 국내 이벤트 ---
+
+def draw_domestic_event(rng) -> int:
+    return rng.randint(1, len(config.domestic_events))
+
+
+# --- 4. 정보 ---
+
+def gather_intel(team: str, hidden: dict, cooperation: dict, rng) -> list:
+    """Events 페이지의 정보 수집 (대상은 플레이어 대신 무작위로)."""
+    intel_score = hidden[team].get("Intelligence", 5)
+    pool = [c for c in hidden if c != team]
+    if not pool:
+        return []
+    coop_keys = list(config.coop_params)
+
+    def hidden_intel(country, param):
+        return f"{country}'s " + utils.get_hidden_param_info(param, hidden[country][param], intel_score, rng=rng)
+
+    def coop_intel(country, param):
+        val = cooperation[country].get(team, {}).get(param, "None")
+        return f"{country}'s " + utils.get_coop_info(param, val, intel_score, config.coop_params[param].get("options"), rng=rng)
+
+    def random_intel(country):
+        if rng.random() < 0.5:
+            return hidden_intel(country, rng.choice(utils.POLICY_PARAMS))
+        return coop_intel(country, rng.choice(coop_keys))
+
+    reports = [random_intel(rng.choice(pool))]
+    if intel_score >= 2:
+        reports.append(random_intel(rng.choice(pool)))
+    if intel_score >= 6:
+        reports.append(coop_intel(rng.choice(pool), rng.choice(coop_keys)))
+    if intel_score >= 9:
+        reports.append(hidden_intel(rng.choice(pool), rng.choice(utils.POLICY_PARAMS)))
+    return reports
+
+
+# --- 5. 최종 정책 조정 ---
+
+def adjustment_range(hidden: dict, param: str) -> tuple:
+    """param의 허용 범위 (min, max). 남은 포인트가 없으면 (현재값, 현재값)."""
+    current = hidden[param]
+    if param == "Alignment_US":
+        return 0, 10
+    remaining = utils.POLICY_BUDGET - utils.policy_points(hidden)
+    if remaining <= 0:
+        return current, current
+    cap = min(MAX_ADJUSTMENT, remaining)
+    return max(0, current - cap), min(10, current + cap)
+
+
+def apply_adjustment(hidden: dict, param: str, new_value: int) -> dict:
+    """파라미터 하나만 바꾼 hidden의 복사본."""
+    if param not in utils.POLICY_PARAMS or param == "Alignment_China":
+        raise ValueError(f"{param} cannot be adjusted")
+    low, high = adjustment_range(hidden, param)
+    if not low <= new_value <= high:
+        raise ValueError(f"{param}={new_value} is outside the allowed range {low}..{high}")
+    adjusted = dict(hidden)
+    adjusted[param] = new_value
+    if param == "Alignment_US":
+        adjusted["Alignment_China"] = 10 - new_value
+    return adjusted
+
+
+# --- 6. 국제 이벤트 ---
+
+def draw_international_events(rng) -> list:
+    return rng.sample(range(len(config.international_events)), INTERNATIONAL_EVENTS_PER_ROUND)
+
+
+# --- 7. 요약 ---
+
+def round_summary(round_results: dict) -> dict:
+    """utils.score_all_teams 결과 -> Summary 페이지의 국가별 행."""
+    all_results = {}
+    for name, ((final_p, final_m), details) in round_results.items():
+        all_results[name] = {
+            'papers': int(final_p),
+            'models': int(final_m),
+            'paper_delta': int(details.get('total_paper_delta', 0)),
+            'model_delta': float(details.get('total_model_delta', 0)),
+            'delta_details': details
+        }
+    return all_results
+
+
+def update_superpowers(initial_scores: dict, rng) -> dict:
+    """미국/중국은 무작위로 논문이 늘고, 모델은 calculate_ai_models를 따릅니다."""
+    results = {}
+    for name in SUPERPOWERS:
+        papers_initial = initial_scores.get(name, {}).get('papers', 0)
+        models_initial = initial_scores.get(name, {}).get('models', 0)
+        delta = rng.randint(*SUPERPOWER_PAPER_GROWTH[name])
+        papers_final = papers_initial + delta
+        models_final = utils.calculate_ai_models(papers_final)
+        results[name] = {
+            'papers': papers_final, 'models': int(models_final),
+            'paper_delta': delta, 'model_delta': models_final - models_initial
+        }
+    return results
+
+
+def play_round(state: GameState, decisions: dict, rng=None) -> RoundReport:
+    """decisions의 팀들로 한 라운드를 진행하고 state를 갱신한 뒤 보고서를 반환합니다."""
+    rng = rng or random.Random()
+    teams = [t for t in PLAYER_TEAMS if t in decisions]
+
+    # 1. 정책
+    hidden = {team: build_hidden(team, decisions[team].policy) for team in teams}
+
+    # 2. 협력
+    cooperation = settle_cooperation({team: decisions[team].cooperation for team in teams}, hidden)
+
+    # 3. 국내 이벤트
+    domestic = {team: draw_domestic_event(rng) for team in teams}
+
+    # 4. 정보
+    intel = {team: gather_intel(team, hidden, cooperation, rng) for team in teams}
+
+    # 5. 최종 정책 조정
+    for team in teams:
+        if decisions[team].adjustment is not None:
+            hidden[team] = apply_adjustment(hidden[team], *decisions[team].adjustment)
+    growth = {team: growth_rate(team, hidden[team]) for team in teams}
+
+    # 6. 국제 이벤트
+    international = draw_international_events(rng)
+
+    # 7. 요약
+    inputs = {team: (hidden[team], cooperation[team], config.domestic_events[domestic[team]]) for team in teams}
+    round_results = utils.score_all_teams(
+        inputs, [config.international_events[i] for i in international], state.scores, growth
+    )
+    results = round_summary(round_results)
+    results.update(update_superpowers(state.scores, rng))
+
+    state.history.append({"round": state.round, "scores": results})
+    for name, data in results.items():
+        state.scores[name] = {'papers': data['papers'], 'models': data['models']}
+    report = RoundReport(state.round, hidden, growth, cooperation, domestic, intel, international, results)
+    state.round += 1
+    return report
@@ -0,0 +1,393 @@
+# formulas.py
+# 이벤트 수식(config.py의 delta_papers / delta_models)을 한 번만 컴파일해 재사용합니다.
+# 코드 객체는 수식 문자열로 캐시하므로 공유 파일에서 온 같은 수식도 캐시를 씁니다.
+# 수식 id: "domestic:3:delta_papers", "international:0:delta_models" (국제 이벤트는 리스트 위치)
+import ast
+import logging
+import math
+import threading
+
+import numpy as np
+
+import config
+import instrument
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("delta_papers", "delta_models")
+
+# 수식에서 게임 파라미터 외에 쓸 수 있는 이름 (한 번 만들어 모든 호출에서 공유)
+FORMULA_GLOBALS = {
+    "__builtins__": {},
+    "round": round,
+    "min": min,
+    "max": max,
+    "int": int,
+    "sqrt": np.sqrt,
+    "np": np,
+    "mean": np.mean,
+    "log": math.log,
+    "exp": math.exp,
+    "abs": abs
+}
+
+
+class FormulaError(ValueError):
+    """컴파일할 수 없는 수식."""
+
+
+_code_cache = {}      # 수식 문자열 -> 코드 객체
+_rejected_text = {}   # 수식 문자열 -> 오류 메시지
+
+catalog = {}          # 수식 id -> 수식 문자열
+rejected = {}         # 수식 id -> 오류 메시지 (평가하지 않고 항상 0)
+_compiled = {}        # 수식 id -> 코드 객체
+
+
+def formula_id(kind: str, key, field: str) -> str:
+    return f"{kind}:{key}:{field}"
+
+
+def compile_formula(expr: str):
+    """expr의 코드 객체 (처음 한 번만 컴파일)."""
+    code = _code_cache.get(expr)
+    if code is not None:
+        return code
+    if expr in _rejected_text:
+        raise FormulaError(_rejected_text[expr])
+    try:
+        code = compile(expr.strip(), "<formula>", "eval")
+    except SyntaxError as e:
+        _rejected_text[expr] = f"{e.msg} in formula: {expr}"
+        raise FormulaError(_rejected_text[expr]) from e
+    _code_cache[expr] = code
+    return code
+
+
+def safe_params(params: dict) -> dict:
+    """수식에 넘길 수 있는 값 (스칼라와 None)만 남깁니다."""
+    return {
+        k: v
+        for k, v in params.items()
+        if isinstance(v, (int, float, str)) or v is None
+    }
+
+
+def _run(code, params: dict, safe_locals=None) -> int:
+    if instrument.ENABLED:
+        instrument.count("formulas.scalar_evaluations")
+    # safe_locals를 받으면 여러 수식이 같이 쓰므로 복사본으로 평가
+    safe_locals = safe_params(params) if safe_locals is None else dict(safe_locals)
+    try:
+        return int(eval(code, FORMULA_GLOBALS, safe_locals))
+    except Exception as e:
+        # 협력 값이 없거나(None) 범주형 고정값("High")이면 실패하는 수식이 있음 -> 변화 없음(0)
+        logger.debug("formula evaluated to 0: %s", e)
+        return 0
+
+
+def evaluate(fid: str, params: dict) -> int:
+    """카탈로그 수식을 id로 평가합니다. 거부된 수식은 항상 0."""
+    load_catalog()
+    code = _compiled.get(fid)
+    if code is None:
+        if fid in rejected:
+            return 0
+        raise KeyError(f"Unknown formula id: {fid}")
+    return _run(code, params)
+
+
+def evaluate_expr(expr: str, params: dict) -> int:
+    """수식 문자열을 (컴파일 캐시를 써서) 평가합니다."""
+    try:
+        code = compile_formula(expr)
+    except FormulaError:
+        return 0
+    return _run(code, params)
+
+
+def evaluate_exprs(exprs: list, safe_locals: dict) -> list:
+    """safe_params로 정리한 같은 파라미터로 여러 수식 문자열을 평가합니다."""
+    out = []
+    for expr in exprs:
+        try:
+            code = compile_formula(expr)
+        except FormulaError:
+            out.append(0)
+            continue
+        out.append(_run(code, safe_locals, safe_locals))
+    return out
+
+
+def _register(fid: str, expr: str):
+    catalog[fid] = expr
+    try:
+        _compiled[fid] = compile_formula(expr)
+    except FormulaError as e:
+        rejected[fid] = str(e)
+        logger.warning("Rejected %s: %s", fid, e)
+
+
+def _compile_catalog():
+    for eid, event in config.domestic_events.items():
+        for field in FIELDS:
+            _register(formula_id("domestic", eid, field), event[field])
+    for idx, event in enumerate(config.international_events):
+        for field in FIELDS:
+            _register(formula_id("international", idx, field), event[field])
+
+
+# --- 의존성 인덱스 ---
+# 수식마다 읽는 파라미터(자유 변수)와 그 반대 방향 인덱스. load_catalog()가 채웁니다.
+# 알 수 없는 파라미터 이름은 거부된 수식처럼 경고로 남깁니다.
+
+KNOWN_PARAMS = frozenset(config.parameter_descriptions) | frozenset(config.coop_params)
+
+_free_cache = {}      # 수식 문자열 -> 자유 변수 이름들
+
+dependencies = {}     # 수식 id -> 읽는 파라미터 이름들
+dependents = {}       # 파라미터 이름 -> 그 파라미터를 읽는 수식 id들
+unknown_names = {}    # 수식 id -> 알 수 없는 이름들
+
+
+def free_variables(expr: str) -> frozenset:
+    """expr가 파라미터에서 읽는 이름들. 파싱할 수 없으면 FormulaError."""
+    names = _free_cache.get(expr)
+    if names is not None:
+        return names
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"{e.msg} in formula: {expr}") from e
+    loaded, bound = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            (loaded if isinstance(node.ctx, ast.Load) else bound).add(node.id)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+    names = frozenset(loaded - bound - FORMULA_GLOBALS.keys())
+    _free_cache[expr] = names
+    return names
+
+
+def event_key(fid: str) -> tuple:
+    """수식 id -> (종류, 키). 예: "domestic:3:delta_papers" -> ("domestic", 3)"""
+    kind, key, _ = fid.split(":")
+    return kind, int(key)
+
+
+def formulas_reading(*params) -> set:
+    """params 중 하나라도 읽는 카탈로그 수식 id들."""
+    load_catalog()
+    return set().union(*(dependents.get(p, ()) for p in params))
+
+
+def events_reading(*params) -> set:
+    """params 중 하나라도 읽는 수식이 있는 이벤트들의 (종류, 키)."""
+    return {event_key(fid) for fid in formulas_reading(*params)}
+
+
+def event_params(kind: str, key) -> frozenset:
+    """한 이벤트의 두 수식이 읽는 파라미터들."""
+    load_catalog()
+    return frozenset().union(*(dependencies.get(formula_id(kind, key, f), ()) for f in FIELDS))
+
+
+def _index_catalog():
+    for fid, expr in catalog.items():
+        if fid in rejected:
+            continue
+        names = free_variables(expr)
+        dependencies[fid] = names
+        for name in names:
+            dependents.setdefault(name, set()).add(fid)
+        unknown = names - KNOWN_PARAMS
+        if unknown:
+            unknown_names[fid] = frozenset(unknown)
+            logger.warning("Unknown parameter(s) in %s: %s", fid, ", ".join(sorted(unknown)))
+
+
+_catalog_lock = threading.Lock()
+_catalog_loaded = False
+
+
+def load_catalog():
+    """config의 수식을 컴파일하고 인덱스를 만듭니다. import 시가 아니라 처음 쓸 때 한 번만."""
+    global _catalog_loaded
+    if _catalog_loaded:
+        return
+    with _catalog_lock:
+        if not _catalog_loaded:
+            _compile_catalog()
+            _index_catalog()
+            _catalog_loaded = True
+
+
+# --- 벡터화 평가 ---
+# 같은 수식을 NumPy 형태로도 컴파일해 여러 파라미터 조합(예: 팀 × 파트너)을 한 번에 평가합니다.
+# a if c else b -> where, min/max -> 원소별, x in [...] -> 원소별 포함 여부로 바꾸고,
+# 정확히 표현할 수 없는 칸은 스칼라 평가로 계산하므로 결과는 항상 evaluate()와 같습니다.
+
+class _Missing:
+    """그 칸에 없는 파라미터 (스칼라 평가라면 NameError)."""
+    def __repr__(self):
+        return "<missing>"
+
+
+MISSING = _Missing()
+
+
+def _vmin(*args):
+    items = args[0] if len(args) == 1 else args
+    out = items[0]
+    for item in items[1:]:
+        out = np.minimum(out, item)
+    return out
+
+
+def _vmax(*args):
+    items = args[0] if len(args) == 1 else args
+    out = items[0]
+    for item in items[1:]:
+        out = np.maximum(out, item)
+    return out
+
+
+def _vround(x, ndigits=None):
+    return np.round(x) if ndigits is None else np.round(x, ndigits)
+
+
+def _vint(x):
+    return np.trunc(np.asarray(x, dtype=float))
+
+
+def _vmean(items):
+    return np.mean(np.broadcast_arrays(*items), axis=0)
+
+
+def _vcontains(x, options, negate=False):
+    hit = np.frompyfunc(lambda v: v in options, 1, 1)(x).astype(bool)
+    return ~hit if negate else hit
+
+
+VECTOR_GLOBALS = {
+    "__builtins__": {},
+    "np": np,
+    "_where": np.where,
+    "_not": np.logical_not,
+    "_contains": _vcontains,
+    "round": _vround,
+    "min": _vmin,
+    "max": _vmax,
+    "int": _vint,
+    "sqrt": np.sqrt,
+    "mean": _vmean,
+    "_np_mean": _vmean,
+    "log": np.log,
+    "exp": np.exp,
+    "abs": np.abs
+}
+
+
+class _Vectorizer(ast.NodeTransformer):
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return ast.Call(ast.Name("_where", ast.Load()), [node.test, node.body, node.orelse], [])
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.Call(ast.Name("_not", ast.Load()), [node.operand], [])
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1 and isinstance(node.ops[0], (ast.In, ast.NotIn)):
+            negate = ast.Constant(isinstance(node.ops[0], ast.NotIn))
+            return ast.Call(ast.Name("_contains", ast.Load()), [node.left, node.comparators[0], negate], [])
+        return node
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        if isinstance(node.value, ast.Name) and node.value.id == "np" and node.attr == "mean":
+            return ast.Name("_np_mean", ast.Load())
+        return node
+
+
+_vector_cache = {}    # 수식 문자열 -> (벡터 코드 객체, 읽는 이름들)
+
+
+def compile_vectorized(expr: str):
+    """expr의 NumPy 형태 (code, names). 처음 한 번만 컴파일합니다."""
+    cached = _vector_cache.get(expr)
+    if cached is not None:
+        return cached
+    scalar_code = compile_formula(expr)
+    tree = _Vectorizer().visit(ast.parse(expr.strip(), mode="eval"))
+    code = compile(ast.fix_missing_locations(tree), "<formula>", "eval")
+    cached = (code, frozenset(scalar_code.co_names))
+    _vector_cache[expr] = cached
+    return cached
+
+
+class Columns(dict):
+    """파라미터 이름 -> NumPy 열. MISSING 칸이 있는 열은 missing에 마스크를 둡니다."""
+    def __init__(self):
+        super().__init__()
+        self.missing = {}
+
+
+def pack_columns(rows: dict) -> Columns:
+    """{이름: 값의 중첩 리스트} -> NumPy 열. 정수만 있으면 int64, 숫자면 float64, 나머지는 object."""
+    columns = Columns()
+    for name, values in rows.items():
+        arr = np.array(values, dtype=object)
+        flat = arr.ravel().tolist()
+        if all(isinstance(v, int) for v in flat):
+            arr = arr.astype(np.int64)
+        elif all(isinstance(v, (int, float)) for v in flat):
+            arr = arr.astype(np.float64)
+        elif any(v is MISSING for v in flat):
+            columns.missing[name] = np.array([v is MISSING for v in flat]).reshape(arr.shape)
+        columns[name] = arr
+    return columns
+
+
+def evaluate_batch(expr: str, columns: dict, shape: tuple, mask=None) -> np.ndarray:
+    """
+    shape의 모든 칸에서 expr를 한 번에 평가합니다. columns는 shape로 broadcast되는 열 (pack_columns).
+    mask가 False인 칸은 0. 각 칸은 그 칸의 파라미터로 evaluate_expr()를 부른 값과 같습니다.
+    """
+    if instrument.ENABLED:
+        instrument.count("formulas.batch_evaluations")
+    out = np.zeros(shape, dtype=np.int64)
+    todo = np.ones(shape, dtype=bool) if mask is None else np.broadcast_to(mask, shape).copy()
+    if not todo.any():
+        return out
+    try:
+        code, names = compile_vectorized(expr)
+    except FormulaError:
+        return out
+
+    # 수식이 읽는 파라미터가 없는 칸은 바로 스칼라 평가로
+    scalar = np.zeros(shape, dtype=bool)
+    for name in names & getattr(columns, "missing", {}).keys():
+        scalar |= columns.missing[name]
+
+    try:
+        with np.errstate(all="ignore"):
+            values = np.broadcast_to(np.asarray(eval(code, VECTOR_GLOBALS, columns), dtype=float), shape)
+        fast = todo & ~scalar & np.isfinite(values)
+        out[fast] = np.trunc(values[fast]).astype(np.int64)
+        scalar = todo & ~fast
+    except Exception:
+        scalar = todo
+
+    if scalar.any():
+        code = compile_formula(expr)
+        cells = np.nonzero(scalar)
+        used = {name: np.broadcast_to(columns[name], shape)[cells].tolist() for name in names & columns.keys()}
+        for i, idx in enumerate(zip(*cells)):
+            params = {name: values[i] for name, values in used.items() if values[i] is not MISSING}
+            out[idx] = _run(code, params)
+    return out
@@ -1,6 +1,12 @@
+import sys
+from pathlib import Path
 
 import numpy as np
 
+# Batch evaluation uses the game's vectorized formula compiler (formulas.compile_vectorized).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import formulas
+
 # Event loss formulas (extend this dictionary to include all your events)
 event_formulas = {
     1: {
@@ -34,6 +40,34 @@ def evaluate_events(event_ids, params):
         results.append([Δ_models, Δ_papers])
     return np.array(results)
 
+def _columns(profiles) -> dict:
+    """Parameter name -> 1-D array, from a NumPy structured array, a DataFrame or a dict of arrays."""
+    if isinstance(profiles, np.ndarray) and profiles.dtype.names:
+        return {name: profiles[name] for name in profiles.dtype.names}
+    if hasattr(profiles, "columns"):   # pandas.DataFrame (pandas itself is not required)
+        return {str(name): profiles[name].to_numpy() for name in profiles.columns}
+    return {name: np.asarray(values) for name, values in profiles.items()}
+
+# Batch version of evaluate_events: one vectorized pass per formula over every profile
+def evaluate_events_batch(event_ids, profiles):
+    """
+    Returns a (profiles x events x 2) float array; the last axis is [Δ_models, Δ_papers]
+    like evaluate_events. Row i equals evaluate_events(event_ids, profile i). Profiles on
+    which the scalar formula would raise (e.g. division by zero) come out as NaN.
+    """
+    columns = _columns(profiles)
+    n = len(next(iter(columns.values())))
+    out = np.empty((n, len(event_ids), 2))
+    for e, eid in enumerate(event_ids):
+        if eid not in event_formulas:
+            raise ValueError(f"Event {eid} not defined.")
+        for f, key in enumerate(["Δ_models", "Δ_papers"]):
+            code, _ = formulas.compile_vectorized(event_formulas[eid][key])
+            with np.errstate(all="ignore"):
+                values = np.asarray(eval(code, formulas.VECTOR_GLOBALS, columns), dtype=float)
+            out[:, e, f] = np.where(np.isfinite(values), values, np.nan)
+    return out
+
 # Function to evaluate diplomacy outcome
 def evaluate_diplomacy(
     Alignment_US, Alignment_China,
@@ -55,6 +89,27 @@ def evaluate_diplomacy(
 
     return success, bonus
 
+# Batch version of evaluate_diplomacy: every argument may be an array (broadcast together)
+def evaluate_diplomacy_batch(
+    Alignment_US, Alignment_China,
+    AI_Change_US, AI_Change_China,
+    Total_AI_paper_US, Total_AI_paper_China,
+    tolerance=0.2
+):
+    """Returns (success, bonus) int arrays; element i equals evaluate_diplomacy on element i."""
+    a_us, a_cn, c_us, c_cn, p_us, p_cn = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (Alignment_US, Alignment_China, AI_Change_US, AI_Change_China,
+                                               Total_AI_paper_US, Total_AI_paper_China))
+    )
+    valid = (a_cn != 0) & (c_cn != 0)
+    with np.errstate(all="ignore"):
+        ratio_error = np.abs(a_us / a_cn - c_us / c_cn)
+        total_paper = p_us + p_cn
+        bonus = np.rint(2 * (p_us * a_us + p_cn * a_cn) / total_paper)   # round() also rounds half to even
+    success = valid & (ratio_error <= tolerance)
+    bonus = np.where(valid & (total_paper != 0), bonus, 0)
+    return success.astype(np.int64), bonus.astype(np.int64)
+
 if __name__ == "__main__":
     # Example: Evaluate events 1 to 4 with example parameter values
     example_params = {
@@ -89,3 +144,11 @@ if __name__ == "__main__":
         Total_AI_paper_China=180
     )
     print(f"Diplomacy Model Bonus: {success}, Diplomacy Paper Bonus: {bonus}")
+
+    # Example: sweep 100,000 random parameter profiles in one pass
+    rng = np.random.default_rng(0)
+    names = ["AI_Investment_Focus", "Talent_Index", "Education_Investment", "Electricity", "Semiconductor", "AI_Literacy_Education"]
+    profiles = {name: rng.integers(0, 11, 100_000) for name in names}
+    sweep = evaluate_events_batch(event_ids, profiles)
+    print(f"Mean event impact over {len(sweep)} profiles (Δ_models, Δ_papers):")
+    print(np.nanmean(sweep, axis=0))
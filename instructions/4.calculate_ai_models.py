@@ -1,20 +1,9 @@
-import numpy as np
-from scipy.stats import norm
+import sys
+from pathlib import Path
 
-# Constants
-u = 84.17
-threshold = 40 * u / 19
-
-def calculate_ai_models(paper_count, normalize_to=15, reference_variance=2000):
-    std_dev = np.sqrt(paper_count)
-    z_score = (threshold - u) / std_dev
-    probability = 1 - norm.cdf(z_score)
-    
-    reference_std = np.sqrt(reference_variance)
-    ref_prob = 1 - norm.cdf((threshold - u) / reference_std)
-    scaling_factor = normalize_to / ref_prob
-    
-    return probability * scaling_factor
+# Same implementation as the game (utils.calculate_ai_models), accepts arrays.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils import calculate_ai_models
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+# instrument.py
+# 페이지별, 단계별 계측. 기본은 꺼짐 (SRT_INSTRUMENT=1로 켬, 꺼져 있으면 훅마다 플래그 확인 한 번)
+# 켜면 페이지 실행마다 시간, 단계별 시간, 카운터를 SRT_INSTRUMENT_LOG(기본 shared_data/instrument.jsonl)에
+# JSON 한 줄로 남기고, 프로세스 합계는 SRT_METRICS_PORT에서 Prometheus 형식으로 제공합니다.
+# ?admin=<SRT_ADMIN_TOKEN>이면 페이지에 오버레이로 보여줍니다.
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import config
+
+ENABLED = os.environ.get("SRT_INSTRUMENT", "") not in ("", "0")
+LOG_PATH = Path(os.environ.get("SRT_INSTRUMENT_LOG", config.shared_dir / "instrument.jsonl"))
+METRICS_PORT = os.environ.get("SRT_METRICS_PORT")
+
+_local = threading.local()
+_lock = threading.Lock()
+_totals = {
+    "runs": Counter(),          # 페이지 -> 끝난 실행 수
+    "seconds": Counter(),       # 페이지 -> 총 시간
+    "phase_seconds": Counter(), # (페이지, 단계) -> 총 시간
+    "counters": Counter(),      # (페이지, 카운터) -> 합계
+}
+_server_started = False
+
+
+class Run:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.phases = Counter()
+        self.counters = Counter()
+
+    def as_dict(self, interrupted=False):
+        return {
+            "page": self.page,
+            "started": round(self.started, 3),
+            "seconds": round(time.perf_counter() - self.t0, 6),
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "counters": dict(self.counters),
+            "interrupted": interrupted,
+        }
+
+
+def _current():
+    return getattr(_local, "run", None)
+
+
+def count(name, n=1):
+    """현재 페이지 실행의 카운터에 n을 더합니다 (페이지 밖이면 'background')."""
+    if not ENABLED or not n:
+        return
+    run = _current()
+    if run is not None:
+        run.counters[name] += n
+    else:
+        with _lock:
+            _totals["counters"][("background", name)] += n
+
+
+def phase(name):
+    """현재 페이지 실행의 한 단계 시간을 잽니다."""
+    if not ENABLED:
+        return nullcontext()
+    return _phase(name)
+
+
+@contextmanager
+def _phase(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        run = _current()
+        if run is not None:
+            run.phases[name] += time.perf_counter() - t0
+
+
+def start_page(page):
+    """
+    페이지 실행을 시작합니다. finish()까지 가지 못한 이전 실행 (st.rerun, st.switch_page, st.stop)은
+    중단된 실행으로 기록합니다.
+    """
+    if not ENABLED:
+        return
+    _ensure_server()
+    if _current() is not None:
+        _record(_current(), interrupted=True)
+    _local.run = Run(page)
+
+
+def finish():
+    if not ENABLED or _current() is None:
+        return
+    _record(_current(), interrupted=False)
+    _local.run = None
+
+
+def _record(run, interrupted):
+    entry = run.as_dict(interrupted)
+    with _lock:
+        _totals["runs"][run.page] += 1
+        _totals["seconds"][run.page] += entry["seconds"]
+        for name, seconds in run.phases.items():
+            _totals["phase_seconds"][(run.page, name)] += seconds
+        for name, n in run.counters.items():
+            _totals["counters"][(run.page, name)] += n
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(LOG_PATH, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+# --- 내보내기 ---
+
+def _metric_name(name):
+    return "srt_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+def prometheus_text() -> str:
+    """프로세스 합계를 Prometheus 텍스트 형식으로."""
+    with _lock:
+        runs = dict(_totals["runs"])
+        seconds = dict(_totals["seconds"])
+        phases = dict(_totals["phase_seconds"])
+        counters = dict(_totals["counters"])
+    lines = [
+        "# TYPE srt_page_runs_total counter",
+        *(f'srt_page_runs_total{{page="{p}"}} {n}' for p, n in sorted(runs.items())),
+        "# TYPE srt_page_seconds_total counter",
+        *(f'srt_page_seconds_total{{page="{p}"}} {s:.6f}' for p, s in sorted(seconds.items())),
+        "# TYPE srt_phase_seconds_total counter",
+        *(f'srt_phase_seconds_total{{page="{p}",phase="{ph}"}} {s:.6f}' for (p, ph), s in sorted(phases.items())),
+    ]
+    for name in sorted({name for _, name in counters}):
+        metric = _metric_name(name) + "_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines += [f'{metric}{{page="{p}"}} {n}' for (p, c), n in sorted(counters.items()) if c == name]
+    return "\n".join(lines) + "\n"
+
+
+def _ensure_server():
+    """SRT_METRICS_PORT에서 prometheus_text()를 제공합니다 (프로세스당 한 번, 데몬 스레드)."""
+    global _server_started
+    if not METRICS_PORT or _server_started:
+        return
+    with _lock:
+        if _server_started:
+            return
+        _server_started = True
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="srt-metrics").start()
+
+
+# --- 관리자 오버레이 ---
+
+def overlay():
+    """현재 실행의 시간과 카운터 (관리자만: URL에 ?admin=<SRT_ADMIN_TOKEN>)."""
+    token = os.environ.get("SRT_ADMIN_TOKEN")
+    run = _current()
+    if not ENABLED or not token or run is None:
+        return
+    import streamlit as st
+
+    if st.query_params.get("admin") != token:
+        return
+    with st.expander("🛠️ Instrumentation (admin)"):
+        st.json(run.as_dict())
+        st.code(prometheus_text(), language="text")
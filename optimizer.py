@@ -0,0 +1,123 @@
+# optimizer.py
+# 100포인트 정책 예산에서 성장률을 정확히 최대화합니다.
+# 성장률은 슬라이더 8개를 서로 독립인 세 그룹(tech, human, cultural)으로만 읽으므로,
+# 그룹별로 포인트 수마다 최선의 값을 표로 만들고 포인트 배분(41 x 21 x 21)을 모두 비교하면 정확합니다.
+#   python optimizer.py                  # 모든 팀의 프런티어
+#   python optimizer.py --team Korea --reserve 15
+import argparse
+import itertools
+from functools import lru_cache
+
+import numpy as np
+
+import config
+import utils
+
+# 그룹 -> 슬라이더 목록 (항 공식은 utils.GROWTH_TERMS 하나만 씁니다)
+GROUPS = {group: list(params) for group, (params, _) in utils.GROWTH_TERMS.items()}
+GROWTH_PARAMS = [p for params in GROUPS.values() for p in params]
+# Alignment_US + Alignment_China는 항상 합쳐서 10포인트
+FREE_BUDGET = utils.POLICY_BUDGET - 10
+
+
+@lru_cache(maxsize=None)
+def term_tables():
+    """그룹 -> (best[b], allocation[b]): 그 그룹에 b포인트 이하로 얻는 최대 항 값과 그 배분."""
+    tables = {}
+    for group, params in GROUPS.items():
+        combos = np.array(list(itertools.product(range(11), repeat=len(params))))
+        values = utils.GROWTH_TERMS[group][1](dict(zip(params, combos.T)))
+        spent = combos.sum(axis=1)
+        best = np.full(10 * len(params) + 1, -np.inf)
+        alloc = [None] * len(best)
+        for b in range(len(best)):
+            idx = np.flatnonzero(spent <= b)
+            i = idx[np.argmax(values[idx])]
+            best[b] = values[i]
+            alloc[b] = dict(zip(params, combos[i].tolist()))
+        tables[group] = (best, alloc)
+    return tables
+
+
+@lru_cache(maxsize=None)
+def _best_by_budget():
+    """성장 예산 B마다 (최대 tech*human + cultural, (b_tech, b_human, b_cultural))."""
+    tech, _ = term_tables()["tech"]
+    human, _ = term_tables()["human"]
+    cult, _ = term_tables()["cultural"]
+    bt, bh, bc = np.meshgrid(np.arange(len(tech)), np.arange(len(human)), np.arange(len(cult)), indexing="ij")
+    raw = tech[bt] * human[bh] + cult[bc]
+    total = (bt + bh + bc).ravel()
+    raw = raw.ravel()
+    splits = np.stack([bt.ravel(), bh.ravel(), bc.ravel()], axis=1)
+    best = []
+    max_budget = len(tech) + len(human) + len(cult) - 3
+    for budget in range(max_budget + 1):
+        idx = np.flatnonzero(total <= budget)
+        i = idx[np.argmax(raw[idx])]
+        best.append((float(raw[i]), tuple(splits[i].tolist())))
+    return best
+
+
+def best_growth_allocation(budget: int) -> dict:
+    """
+    budget포인트 이하로 compute_growth_rate를 최대화하는 성장 슬라이더 (8개).
+    팀 고정값은 성장률 전체에 곱해지는 양수 배수일 뿐이라 최적 배분은 팀과 무관합니다.
+    """
+    best = _best_by_budget()
+    _, split = best[max(0, min(budget, len(best) - 1))]
+    tables = term_tables()
+    alloc = {}
+    for group, b in zip(GROUPS, split):
+        alloc.update(tables[group][1][b])
+    return alloc
+
+
+def growth_for(team: str, alloc: dict) -> int:
+    return utils.compute_growth_rate(alloc, config.fixed_values[team])
+
+
+def pareto_frontier(team: str) -> list:
+    """성장률 대 남는 포인트 프런티어. 각 항목은 그 성장률을 내는 가장 싼 배분입니다."""
+    frontier = []
+    for budget in range(len(_best_by_budget())):
+        alloc = best_growth_allocation(budget)
+        growth = growth_for(team, alloc)
+        if frontier and growth <= frontier[-1]["growth"]:
+            continue
+        frontier.append({
+            "growth_points": sum(alloc.values()),
+            "points_left": FREE_BUDGET - sum(alloc.values()),
+            "growth": growth,
+            "allocation": alloc,
+        })
+    return frontier
+
+
+def suggest_allocation(current: dict) -> dict:
+    """Suggest 버튼: 성장과 무관한 슬라이더는 그대로 두고 남은 포인트를 모두 성장 슬라이더에 최적으로 씁니다."""
+    others = sum(current.get(p, 0) for p in utils.POLICY_PARAMS if p not in GROWTH_PARAMS)
+    budget = max(0, utils.POLICY_BUDGET - others)
+    return {**current, **best_growth_allocation(budget)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact growth-rate maximizer for the 100-point policy budget.")
+    parser.add_argument("--team", choices=list(config.team_credentials), help="default: every team")
+    parser.add_argument("--reserve", type=int, help="points kept for non-growth sliders; prints one allocation")
+    args = parser.parse_args()
+
+    for team in [args.team] if args.team else list(config.team_credentials):
+        print(f"\n{config.country_flags[team]} {team} (multiplier {np.prod(utils.growth_multipliers(config.fixed_values[team])):.3f})")
+        if args.reserve is not None:
+            alloc = best_growth_allocation(FREE_BUDGET - args.reserve)
+            print(f"  growth {growth_for(team, alloc)} with {args.reserve} points reserved: {alloc}")
+            continue
+        print(f"  {'points left':>11}  {'growth':>6}  allocation")
+        for entry in pareto_frontier(team):
+            alloc = " ".join(f"{p[:4]}={v}" for p, v in entry["allocation"].items())
+            print(f"  {entry['points_left']:>11}  {entry['growth']:>6}  {alloc}")
+
+
+if __name__ == "__main__":
+    main()
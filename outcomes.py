@@ -0,0 +1,167 @@
+# outcomes.py
+# 한 팀의 라운드 결과를 모든 이벤트 추첨에 대해 정확히 계산한 분포
+# 국내 이벤트 55개 x 국제 이벤트 쌍 C(45, 2)는 모두 같은 확률이므로, 이벤트별 변화량을 한 번씩만
+# 평가해 두고 각 추첨의 합계를 배열 덧셈으로 구합니다. 각 칸은 utils.finish_round의 총 변화량과 같습니다.
+import argparse
+import itertools
+
+import numpy as np
+
+import config
+import engine
+import formulas
+import utils
+
+DOMESTIC_IDS = list(config.domestic_events)
+DOMESTIC_POS = {eid: d for d, eid in enumerate(DOMESTIC_IDS)}
+PAIRS = np.array(list(itertools.combinations(range(len(config.international_events)),
+                                             engine.INTERNATIONAL_EVENTS_PER_ROUND)))
+METRICS = {"papers": "paper_delta", "models": "model_delta"}
+
+
+class Distribution:
+    """모든 추첨의 변화량 (모든 추첨은 같은 확률)."""
+
+    def __init__(self, paper_delta: np.ndarray, model_delta: np.ndarray):
+        self.paper_delta = paper_delta   # [국내 이벤트, 국제 이벤트 쌍], int
+        self.model_delta = model_delta   # [국내 이벤트, 국제 이벤트 쌍], float
+
+    def _values(self, metric):
+        return getattr(self, METRICS[metric])
+
+    def mean(self, metric) -> float:
+        return float(self._values(metric).mean())
+
+    def std(self, metric) -> float:
+        return float(self._values(metric).std())
+
+    def quantile(self, metric, q):
+        """정확한 분위수 (보간 없이 아래 값)."""
+        return np.quantile(self._values(metric), q, method="lower")
+
+    def prob_loss(self, metric) -> float:
+        """라운드 변화량이 음수일 확률."""
+        return float((self._values(metric) < 0).mean())
+
+    def pmf(self, metric):
+        """(서로 다른 값, 확률)."""
+        values, counts = np.unique(self._values(metric), return_counts=True)
+        return values, counts / counts.sum()
+
+    def draw(self, d: int, p: int) -> dict:
+        """배열 위치의 추첨 하나: 이벤트와 변화량."""
+        return {
+            "domestic": DOMESTIC_IDS[d],
+            "international": [int(i) for i in PAIRS[p]],
+            "paper_delta": int(self.paper_delta[d, p]),
+            "model_delta": float(self.model_delta[d, p]),
+        }
+
+    def extremes(self, metric, n=3) -> dict:
+        """metric 기준 최악/최선 추첨 n개."""
+        flat = self._values(metric).ravel()
+        worst = np.argpartition(flat, n)[:n]
+        best = np.argpartition(-flat, n)[:n]
+        pick = lambda idx: [self.draw(*np.unravel_index(i, self.paper_delta.shape)) for i in idx]
+        return {"worst": pick(worst[np.argsort(flat[worst], kind="stable")]),
+                "best": pick(best[np.argsort(-flat[best], kind="stable")])}
+
+
+def event_deltas(hidden: dict, cooperation: dict):
+    """한 팀의 이벤트별 변화량 (국내 [이벤트 x 2], 국제 [이벤트 x 2], 파트너 합계). 마지막 축은 [papers, models]."""
+    domestic = np.array([[utils.evaluate_delta(config.domestic_events[eid][f], hidden) for f in formulas.FIELDS]
+                         for eid in DOMESTIC_IDS], dtype=np.int64)
+    international = utils.evaluate_international_batch(
+        config.international_events, {"team": hidden}, {"team": cooperation}, teams=["team"]
+    )[0].sum(axis=1)
+    return domestic, international
+
+
+def update_event_deltas(deltas, old_hidden: dict, hidden: dict, cooperation: dict):
+    """old_hidden에 대한 이전 결과로부터 event_deltas(hidden, cooperation)를 구합니다 (바뀐 파라미터를 읽는 수식만 다시 평가)."""
+    changed = {k for k in hidden.keys() | old_hidden.keys() if hidden.get(k) != old_hidden.get(k)}
+    if not changed:
+        return deltas
+    domestic, international = deltas[0].copy(), deltas[1].copy()
+    stale = []
+    for fid in formulas.formulas_reading(*changed):
+        (kind, key), field = formulas.event_key(fid), fid.rsplit(":", 1)[1]
+        if kind == "domestic":
+            domestic[DOMESTIC_POS[key], formulas.FIELDS.index(field)] = \
+                utils.evaluate_delta(config.domestic_events[key][field], hidden)
+        else:
+            stale.append((key, field))
+    if stale:
+        totals = utils.evaluate_international_exprs([config.international_events[idx][field] for idx, field in stale],
+                                                    {"team": hidden}, {"team": cooperation}, ["team"])[0].sum(axis=1)
+        for (idx, field), total in zip(stale, totals):
+            international[idx, formulas.FIELDS.index(field)] = total
+    return domestic, international
+
+
+def combine(domestic: np.ndarray, international: np.ndarray, initial_papers, growth) -> Distribution:
+    """모든 (국내 이벤트, 국제 이벤트 쌍)의 합계 (utils.finish_round와 같은 계산)."""
+    pair = international[PAIRS].sum(axis=1)   # [쌍, 필드]
+    paper_delta = growth + domestic[:, None, 0] + pair[None, :, 0]
+
+    # calculate_ai_models는 서로 다른 최종 논문 수에 대해서만 계산합니다 (정수라 종류가 적음).
+    finals, inverse = np.unique(initial_papers + paper_delta, return_inverse=True)
+    models = utils.calculate_ai_models(np.append(finals, initial_papers))
+    from_papers = (models[:-1] - models[-1])[inverse.reshape(paper_delta.shape)]
+    model_delta = domestic[:, None, 1] + pair[None, :, 1] + from_papers
+    return Distribution(paper_delta, model_delta)
+
+
+def _freeze(d: dict):
+    return tuple(sorted((k, _freeze(v) if isinstance(v, dict) else v) for k, v in d.items()))
+
+
+_event_cache = {}   # (hidden, cooperation) -> event_deltas (프로세스 전체에서 공유)
+EVENT_CACHE_SIZE = 256
+
+
+def cached_event_deltas(hidden: dict, cooperation: dict):
+    key = (_freeze(hidden), _freeze(cooperation))
+    cached = _event_cache.get(key)
+    if cached is None:
+        if len(_event_cache) >= EVENT_CACHE_SIZE:
+            _event_cache.clear()
+        domestic, international = event_deltas(hidden, cooperation)
+        domestic.flags.writeable = international.flags.writeable = False
+        cached = _event_cache[key] = (domestic, international)
+    return cached
+
+
+def round_distribution(team: str, hidden: dict, cooperation: dict, initial_scores: dict, growth=None) -> Distribution:
+    """
+    team의 라운드 결과 분포. 이벤트별 변화량은 (hidden, cooperation)마다 캐시하므로
+    시작 점수나 성장률만 바뀌면 합계만 다시 계산합니다.
+    """
+    growth = utils.compute_growth_rate(hidden, config.fixed_values[team]) if growth is None else growth
+    domestic, international = cached_event_deltas(hidden, cooperation or {})
+    return combine(domestic, international, initial_scores.get(team, {}).get('papers', 0), growth)
+
+
+def main():
+    import store
+
+    parser = argparse.ArgumentParser(description="Exact outcome distribution of a team's round over every event draw.")
+    parser.add_argument("--team", choices=list(config.team_credentials), required=True)
+    parser.add_argument("--game", default=store.DEFAULT_GAME)
+    args = parser.parse_args()
+
+    round_num = store.current_round(args.game)
+    hidden = store.load_hidden(args.team, args.game, round_num)
+    if hidden is None:
+        parser.error(f"{args.team} has no saved policy in game '{args.game}'")
+    cooperation = store.load_cooperation(args.team, args.game, round_num) or {}
+    dist = round_distribution(args.team, hidden, cooperation, utils.initial_scores_for(round_num, args.game))
+    print(f"{args.team}, round {round_num}: {dist.paper_delta.size} equally likely draws")
+    for metric in METRICS:
+        p5, p50, p95 = dist.quantile(metric, [0.05, 0.5, 0.95])
+        print(f"  {metric:<6} mean {dist.mean(metric):>8.2f}  std {dist.std(metric):>7.2f}  "
+              f"p5 {p5:>8.2f}  p50 {p50:>8.2f}  p95 {p95:>8.2f}  P(<0) {dist.prob_loss(metric):.3f}")
+
+
+if __name__ == "__main__":
+    main()
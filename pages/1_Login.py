@@ -2,6 +2,7 @@
 import streamlit as st
 from datetime import datetime
 import config
+import store
 
 st.set_page_config(layout="centered", page_title="Login")
 
@@ -17,7 +18,8 @@ if st.session_state.get("authenticated_team"):
          Otherwise, hit the Main Page button below to receive your mission briefing again.   
         """, unsafe_allow_html=True)
     
-    st.success(f"You are already logged in as Team {st.session_state.authenticated_team}.")
+    st.success(f"You are already logged in as Team {st.session_state.authenticated_team} "
+               f"in game lobby '{st.session_state.get('game_id', store.DEFAULT_GAME)}'.")
     
     if st.button("Main Page"):
         st.switch_page("AI_Session.py")
@@ -38,10 +40,19 @@ else:
         """, unsafe_allow_html=True)
 
     with st.form("login_form"):
+        # 게임 로비: 한 서버에서 여러 반이 각자의 게임을 진행합니다.
+        lobbies = [game for game, _ in store.list_games()]
+        lobby = st.selectbox("Select your game lobby:", lobbies)
+        new_lobby = st.text_input("...or open a new lobby (game ID):", help="Up to 32 letters, digits, '-' or '_'. Share it with the other teams of your class.").strip()
         team_name = st.selectbox("Select your team:", list(config.team_credentials.keys()))
         team_code = st.text_input("Enter team code (password):", type="password")
         if st.form_submit_button("Login"):
-            if config.team_credentials.get(team_name) == team_code:
+            game_id = new_lobby or lobby
+            if not store.valid_game_id(game_id):
+                st.error("Invalid game ID. Use up to 32 letters, digits, '-' or '_'.")
+            elif config.team_credentials.get(team_name) == team_code:
+                store.create_game(game_id)
+                st.session_state["game_id"] = game_id
                 st.session_state["authenticated_team"] = team_name
                 st.success("Login successful! Redirecting...")
                 st.switch_page("pages/2_Policy.py")
@@ -1,11 +1,15 @@
 # pages/2_Policy_Parameters.py
 import streamlit as st
 import time
-import json
 import config
+import instrument
+import optimizer
+import projection
+import store
 import utils
 
 st.set_page_config(layout="centered", page_title="Policy Parameters")
+instrument.start_page("Policy")
 
 # 로그인 확인
 if not st.session_state.get("authenticated_team"):
@@ -13,6 +17,7 @@ if not st.session_state.get("authenticated_team"):
     st.switch_page("pages/1_Login.py")
 
 team = st.session_state["authenticated_team"]
+game = st.session_state.get("game_id", store.DEFAULT_GAME)
 st.title(f"Welcome, team {config.country_flags[team]} {team}")
 
 st.markdown("""
@@ -35,11 +40,16 @@ st.title(f"📜 Your AI Policy Parameters")
 hidden_params = {}
 total_score = 0
 
+# 슬라이더 기본값은 session_state에 한 번만 넣습니다 (Suggest 버튼이 값을 바꿀 수 있도록).
+for param in utils.POLICY_PARAMS:
+    if param != "Alignment_China":
+        st.session_state.setdefault(param, 5)
+
 for group, params in config.parameter_groups.items():
     with st.expander(f"**{group}**"):
         for param in params:
             if param == "Alignment_US":
-                us = st.slider("Alignment_US + Alignment_China = 10", 0, 10, 5, key="Alignment_US", help=config.parameter_descriptions["Alignment_US"])
+                us = st.slider("Alignment_US + Alignment_China = 10", 0, 10, key="Alignment_US", help=config.parameter_descriptions["Alignment_US"])
                 cn = 10 - us
                 hidden_params["Alignment_US"] = us
                 hidden_params["Alignment_China"] = cn
@@ -53,12 +63,53 @@ for group, params in config.parameter_groups.items():
                 """, unsafe_allow_html=True)
                 total_score += 10
             elif param != "Alignment_China":
-                val = st.slider(param, 0, 10, 5, key=param, help=config.parameter_descriptions.get(param, ""))
+                val = st.slider(param, 0, 10, key=param, help=config.parameter_descriptions.get(param, ""))
                 hidden_params[param] = val
                 total_score += val
 
 st.markdown(f"**📊 Current Used Policy Points: {total_score}/100**")
 
+# --- What-if 예측 패널: 슬라이더를 움직일 때마다 다시 계산합니다 (projection.py) ---
+with st.expander("🔮 What-if Projection", expanded=True):
+    if total_score > 100:
+        st.warning("Projection is available once your policy fits within 100 points.")
+    else:
+        with instrument.phase("projection"):
+            start = utils.initial_scores_for(store.current_round(game), game).get(team, {})
+            horizon = st.slider("Projection horizon (rounds)", 1, 10, 5, key="projection_rounds")
+            proj = projection.projector(team).project(hidden_params, start, horizon, st.session_state.get("projection"))
+            st.session_state["projection"] = proj
+            exposure = proj.exposure
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("📈 Paper growth / round", proj.growth)
+        col2.metric(f"📄 Papers after {horizon} rounds", f"{proj.papers[-1]:,.0f}", f"{proj.papers[-1] - proj.papers[0]:+,.0f}")
+        col3.metric(f"🤖 Models after {horizon} rounds", f"{proj.models[-1]:,.1f}", f"{proj.models[-1] - proj.models[0]:+,.1f}")
+        st.line_chart({"Papers": proj.papers}, x_label="Rounds from now", height=180)
+        st.line_chart({"Models": proj.models}, x_label="Rounds from now", height=180)
+
+        worst = exposure["worst"]
+        worst_titles = [config.domestic_events[worst["domestic"]]["title"]] + \
+                       [config.international_events[i]["title"] for i in worst["international"]]
+        st.markdown(
+            f"**🎲 Event exposure this round** (every possible draw, no cooperation agreements yet): "
+            f"events add `{exposure['event_papers']:+.1f}` papers and `{exposure['event_models']:+.1f}` models on average; "
+            f"total paper change ranges `{exposure['papers_p5']:+}` … `{exposure['papers_p95']:+}` (p5–p95), "
+            f"with a `{exposure['prob_paper_loss']:.0%}` chance of losing papers. "
+            f"Worst draw: {', '.join(worst_titles)} (`{worst['paper_delta']:+}` papers)."
+        )
+
+def suggest_growth_allocation():
+    # 성장과 무관한 슬라이더는 그대로 두고, 남은 포인트로 성장률이 최대가 되도록 성장 슬라이더를 채웁니다.
+    current = {p: st.session_state.get(p, 5) for p in utils.POLICY_PARAMS if p != "Alignment_China"}
+    current["Alignment_China"] = 10 - current["Alignment_US"]
+    suggestion = optimizer.suggest_allocation(current)
+    for p in optimizer.GROWTH_PARAMS:
+        st.session_state[p] = suggestion[p]
+
+st.button("💡 Suggest Growth Allocation", on_click=suggest_growth_allocation,
+          help="Keeps your other sliders as they are and spends the remaining points on the sliders that drive paper growth.")
+
 with st.expander("🟪 Fixed Conditions"):
     for k, v in config.fixed_values[team].items():
         st.markdown(f"**{k}**: {v}")
@@ -76,8 +127,7 @@ else:
         
         full_hidden_params = {**hidden_params, **config.fixed_values[team]}
         
-        with open(config.shared_dir / f"hidden_{team}.json", "w") as f:
-            json.dump(full_hidden_params, f)
+        store.save_hidden(team, full_hidden_params, game)
 
         st.session_state["growth_rate"] = growth
         st.session_state.hidden_confirmed = True
@@ -88,3 +138,6 @@ else:
         st.switch_page("pages/3_Cooperation.py")
     else:
         st.info("ℹ️ Please adjust your inputs and press 'Confirm Inputs' to compute growth rate.")
+
+instrument.overlay()
+instrument.finish()
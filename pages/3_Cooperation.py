@@ -1,37 +1,14 @@
 # pages/3_Cooperation.py
 import streamlit as st
-import pandas as pd
 import copy
-import json
 import time
+import agreements
 import config  
+import instrument
+import store
 
 st.set_page_config(layout="centered", page_title="Cooperation Phase")
-
-# --- 1. compute_matrix 함수를 파일 내부에 정의 ---
-def compute_matrix(state, partners):
-    columns = ["Parameter", "Points"] + partners
-    rows = []
-    total_points_used = 0
-    country_points = {p: 0 for p in partners}
-
-    # config.coop_params를 사용하도록 수정
-    for param, meta in config.coop_params.items():
-        row = [param, meta["points"]]
-        for country in partners:
-            val = state[country].get(param, "None")
-            display = val if val != "None" else "No"
-            row.append(display)
-            if val not in ["None", "No", "", None]:
-                total_points_used += meta["points"]
-                country_points[country] += meta["points"]
-        rows.append(row)
-    
-    df = pd.DataFrame(rows, columns=columns)
-    used_row = ["Used Points", sum(country_points.values())] + [country_points.get(p, 0) for p in partners]
-    df.loc[len(df.index)] = used_row
-    df = df.astype(str)
-    return df, total_points_used
+instrument.start_page("Cooperation")
 
 # --- 로그인 확인 ---
 if not st.session_state.get("authenticated_team"):
@@ -39,6 +16,7 @@ if not st.session_state.get("authenticated_team"):
     st.switch_page("pages/1_Login.py")
 
 team = st.session_state["authenticated_team"]
+game = st.session_state.get("game_id", store.DEFAULT_GAME)
 partners = [c for c in config.team_credentials if c != team]
 
 st.title(f"🤝 {team} - Cooperative Parameters")
@@ -79,16 +57,17 @@ with st.expander("📜 View Your Hidden Parameters"):
 with st.expander("📈 Estimated Paper Growth (from Hidden Parameters)", expanded=False):
     st.markdown(f"**📈 Notable Papers Growth Rate:** {st.session_state.get('growth_rate', 'N/A')} per round")
 
+# 모든 팀의 제안은 서버의 agreement index에 저장되어 있습니다 (저장할 때마다 해당 팀만 갱신).
+index = agreements.agreement_index(game)
+
 if "cooperation_state" not in st.session_state:
-    # --- 3. config.coop_params를 사용하도록 수정 ---
-    st.session_state.cooperation_state = {
-        c: {k: "None" if v["type"] != "bool" else "No" for k, v in config.coop_params.items()} for c in partners
-    }
+    # --- 3. 이미 저장한 제안이 있으면 그대로, 없으면 기본값("No"/"None")으로 시작 ---
+    st.session_state.cooperation_state = index.offers_of(team)
 
-# 이제 내부 함수인 compute_matrix를 호출합니다.
-matrix_df, all_used = compute_matrix(st.session_state.cooperation_state, partners)
 st.markdown("### 🌐 Cooperation Matrix")
-st.dataframe(matrix_df, use_container_width=True, height=425)
+with instrument.phase("matrix"):
+    st.dataframe(index.matrix(team), use_container_width=True, height=425)
+all_used, _ = index.points_used(team)
 st.markdown(f"**Total Points Used: {all_used} / {coop_limit}**")
 
 st.markdown("### 🧭 Choose a country to negotiate with:")
@@ -133,11 +112,9 @@ if st.button(f"📩 Confirm Agreement with {config.country_flags[selected_countr
 
     st.session_state.cooperation_state = temp_state
     
-    # --- 6. shared_dir 앞에 config. 접두사 추가 ---
-    with open(config.shared_dir / f"cooperation_{team}.json", "w") as f:
-        json.dump(st.session_state.cooperation_state, f)
+    index = agreements.save_offers(team, st.session_state.cooperation_state, game)
 
-    _, used = compute_matrix(st.session_state.cooperation_state, partners)
+    used, _ = index.points_used(team)
 
     if used > coop_limit:
         st.error(f"❌ Saving this agreement would exceed the total point limit. Limit = {coop_limit}, used = {used}")
@@ -150,27 +127,17 @@ if st.button("📥 Confirm All Cooperative Parameters"):
     all_matched = True
     mismatches = []
     
-    try:
-        for other_team in partners:
-            their_file = config.shared_dir / f"cooperation_{other_team}.json"
-            if their_file.exists():
-                with open(their_file) as f:
-                    their_data = json.load(f)
-                for key in config.coop_params:
-                    my_val = st.session_state.cooperation_state.get(other_team, {}).get(key, "None")
-                    their_val = their_data.get(team, {}).get(key, "None")
-                    if my_val != their_val:
-                        all_matched = False
-                        mismatches.append((other_team, key))
-            else:
+    index = agreements.agreement_index(game)
+    for other_team in partners:
+        if index.is_saved(other_team):
+            for key in index.mismatches(team, other_team):
                 all_matched = False
-                st.warning(f"Waiting for {other_team} to save their choices.")
-                
-    except Exception as e:
-        st.error(f"Error checking agreements: {e}")
-        all_matched = False
+                mismatches.append((other_team, key))
+        else:
+            all_matched = False
+            st.warning(f"Waiting for {other_team} to save their choices.")
 
-    _, used = compute_matrix(st.session_state.cooperation_state, partners)
+    used, _ = index.points_used(team)
 
     if used > coop_limit:
         st.error(f"❌ Too many points used. Limit = {coop_limit}, used = {used}")
@@ -182,4 +149,7 @@ if st.button("📥 Confirm All Cooperative Parameters"):
         st.session_state.cooperation_confirmed = True
         st.success(f"✅ All matched! Used {used} / {coop_limit} points. Proceeding to event phase...")
         time.sleep(2)
-        st.switch_page("pages/4_Events.py")
\ No newline at end of file
+        st.switch_page("pages/4_Events.py")
+
+instrument.overlay()
+instrument.finish()
@@ -1,14 +1,17 @@
 # pages/4_Events.py
 import streamlit as st
+import streamlit.components.v1 as components
 import random
-import json
 import time
-import math
-import numpy as np
 import config
+import engine
+import instrument
+import rescore
+import store
 import utils
 
 st.set_page_config(layout="centered", page_title="Event Phase")
+instrument.start_page("Events")
 
 # --- 로그인 확인 ---
 if not st.session_state.get("authenticated_team"):
@@ -16,6 +19,34 @@ if not st.session_state.get("authenticated_team"):
     st.switch_page("pages/1_Login.py")
 
 team = st.session_state.get("authenticated_team")
+game = st.session_state.get("game_id", store.DEFAULT_GAME)
+
+def intel_snapshot():
+    """정보전 단계가 열릴 때 고정한 모든 팀의 hidden / cooperation 상태 (세션 동안 재사용)."""
+    if "intel_snapshot" not in st.session_state:
+        st.session_state["intel_snapshot"] = utils.intel_snapshot(game)
+    return st.session_state["intel_snapshot"]
+
+def shared_hidden(country):
+    """다른 팀의 hidden params. 아직 저장하지 않았다면 LookupError."""
+    return intel_snapshot().hidden(country)
+
+def shared_cooperation(country):
+    """다른 팀의 cooperation 선택. 아직 저장하지 않았다면 LookupError."""
+    return intel_snapshot().cooperation(country)
+
+# 룰렛 숫자를 클라이언트에서 100ms마다 바꿉니다 (서버 rerun 없음).
+ROULETTE_HTML = """
+<div style="font-family: 'Source Sans Pro', sans-serif; font-size: 1.5rem; font-weight: 600;">
+  🔄 Your nation's fate awaits. Press 'Stop' when you're ready. <b id="n"></b>
+</div>
+<script>
+  const n = document.getElementById("n");
+  const spin = () => { n.textContent = 1 + Math.floor(Math.random() * 100); };
+  spin();
+  setInterval(spin, 100);
+</script>
+"""
 
 # --- 페이지 상태 초기화 ---
 # 이 페이지에서 사용할 세션 상태 변수들을 초기화합니다.
@@ -56,16 +87,13 @@ if not st.session_state.event_shown:
         if st.button("⏹ Stop"):
             st.session_state.rolling = False
             # config에서 domestic_events를 가져와 사용합니다.
-            st.session_state.event_result = random.randint(1, len(config.domestic_events))
+            st.session_state.event_result = engine.draw_domestic_event(random)
             st.session_state.stop_time = time.time()
 
     if st.session_state.rolling:
-        placeholder = st.empty()
-        # 룰렛 애니메이션은 사용자가 멈출 때까지 계속됩니다.
-        # time.sleep을 사용하면 다른 상호작용이 멈추므로, 간단한 숫자로 대체합니다.
-        n = random.randint(1, 100)
-        placeholder.markdown(f"### 🔄 Your nation's fate awaits. Press 'Stop' when you're ready. **{n}**")
-        st.rerun() # 부드러운 애니메이션 효과를 위해 rerun 사용
+        # 룰렛 애니메이션은 사용자가 멈출 때까지 브라우저에서 (10 Hz) 돌아갑니다.
+        # 서버는 페이지를 다시 실행하지 않고, 'Stop'을 눌렀을 때만 이벤트를 추첨합니다.
+        components.html(ROULETTE_HTML, height=60)
 
 # 이벤트 결과가 있으면 표시합니다.
 if st.session_state.event_result:
@@ -76,9 +104,8 @@ if st.session_state.event_result:
         st.session_state["event_title"] = event["title"]
         st.session_state["event_description"] = event["description"]
 
-        # 파일 저장 로직은 여기에 둡니다.
-        with open(config.shared_dir / f"domestic_{team}.json", "w") as f:
-            json.dump(event, f)
+        # 공유 상태 저장 로직은 여기에 둡니다.
+        store.save_domestic(team, event, game)
         
         st.session_state.event_shown = True
         st.rerun() # 상태 저장 후 UI를 새로고침
@@ -116,16 +143,12 @@ Interpret it wisely, and your nation could outmaneuver its competitors in both g
         val_str = ""
         try:
             if random.random() < 0.5:
-                # config.shared_dir 사용
-                with open(config.shared_dir / f"hidden_{rand_country}.json") as f:
-                    h1 = json.load(f)
+                h1 = shared_hidden(rand_country)
                 p1 = random.choice(list(h1.keys()))
                 # utils.get_hidden_param_info 사용
                 val_str = utils.get_hidden_param_info(p1, h1.get(p1, 0), intel_score)
             else:
-                # config.shared_dir 사용
-                with open(config.shared_dir / f"cooperation_{rand_country}.json") as f:
-                    c1 = json.load(f)
+                c1 = shared_cooperation(rand_country)
                 # config.coop_params 사용
                 coop_keys = list(config.coop_params.keys())
                 p1 = random.choice(coop_keys)
@@ -135,7 +158,7 @@ Interpret it wisely, and your nation could outmaneuver its competitors in both g
             
             st.session_state["intel_step1_result_value"] = f"{rand_country}'s {val_str}"
 
-        except FileNotFoundError:
+        except LookupError:
             st.session_state["intel_step1_result_value"] = f"Could not retrieve intel on {rand_country}. Their files are not ready."
         except Exception as e:
             st.session_state["intel_step1_result_value"] = f"An error occurred while getting intel: {e}"
@@ -155,19 +178,17 @@ Interpret it wisely, and your nation could outmaneuver its competitors in both g
             if st.button("🔍 Reveal Step 2 Intel", key="reveal2"):
                 try:
                     if random.random() < 0.5:
-                        with open(config.shared_dir / f"hidden_{sel2}.json") as f:
-                            h2 = json.load(f)
+                        h2 = shared_hidden(sel2)
                         p2 = random.choice(list(h2.keys()))
                         result = utils.get_hidden_param_info(p2, h2.get(p2, 0), intel_score)
                     else:
-                        with open(config.shared_dir / f"cooperation_{sel2}.json") as f:
-                            c2 = json.load(f)
+                        c2 = shared_cooperation(sel2)
                         p2 = random.choice(list(config.coop_params.keys()))
                         val = c2.get(team, {}).get(p2, "None")
                         result = utils.get_coop_info(p2, val, intel_score, config.coop_params[p2].get("options"))
                     st.session_state["intel_result_step2"] = f"{sel2}'s {result}"
-                except FileNotFoundError:
-                    st.session_state["intel_result_step2"] = f"File not found for {sel2}. They may not have saved their choices yet."
+                except LookupError:
+                    st.session_state["intel_result_step2"] = f"No saved choices for {sel2}. They may not have saved their choices yet."
                 
                 st.session_state["intel_shown_step2"] = True
                 st.rerun()
@@ -182,14 +203,13 @@ Interpret it wisely, and your nation could outmaneuver its competitors in both g
         if not st.session_state.get("intel_shown_step3", False):
             if st.button("🔍 Reveal Step 3 Intel", key="reveal3"):
                 try:
-                    with open(config.shared_dir / f"cooperation_{sel3}.json") as f:
-                        coop_data = json.load(f)
+                    coop_data = shared_cooperation(sel3)
                     val = coop_data.get(team, {}).get(coop_key, "None")
                     meta = config.coop_params[coop_key]
                     result = utils.get_coop_info(coop_key, val, intel_score, meta.get("options"))
                     st.session_state["intel_result_step3"] = f"{sel3}'s {result}"
-                except FileNotFoundError:
-                     st.session_state["intel_result_step3"] = f"File not found for {sel3}."
+                except LookupError:
+                     st.session_state["intel_result_step3"] = f"No saved choices for {sel3}."
 
                 st.session_state["intel_shown_step3"] = True
                 st.rerun()
@@ -210,12 +230,11 @@ Interpret it wisely, and your nation could outmaneuver its competitors in both g
         if not st.session_state.get("intel_shown_step4", False):
             if st.button("🔍 Reveal Step 4 Intel", key="reveal4"):
                 try:
-                    with open(config.shared_dir / f"hidden_{sel4}.json") as f:
-                        h4 = json.load(f)
+                    h4 = shared_hidden(sel4)
                     result = utils.get_hidden_param_info(hidden_key, h4.get(hidden_key, 0), intel_score)
                     st.session_state["intel_result_step4"] = f"{sel4}'s {result}"
-                except FileNotFoundError:
-                    st.session_state["intel_result_step4"] = f"File not found for {sel4}."
+                except LookupError:
+                    st.session_state["intel_result_step4"] = f"No saved choices for {sel4}."
 
                 st.session_state["intel_shown_step4"] = True
                 st.rerun()
@@ -238,36 +257,55 @@ if st.session_state.intel_shown and not st.session_state.adjustment_confirmed:
     st.markdown("---")
     st.header("🛠️ Final Policy Adjustment")
 
-    used_points = sum([v for k, v in st.session_state.items() if k.startswith("hidden_params_") and isinstance(v, (int, float))])
-    remaining = 100 - used_points
+    current_hidden = {p: st.session_state.get(f"hidden_params_{p}", 0) for p in utils.POLICY_PARAMS}
+    remaining = utils.POLICY_BUDGET - utils.policy_points(current_hidden)
 
     if remaining <= 0:
         st.info("✅ You used all your policy points. No adjustments possible.")
         st.session_state.adjustment_confirmed = True # 조정 불가 시 바로 확정 처리
         st.rerun()
     else:
-        st.markdown(f"**💻 Remaining Points: `{remaining}` | Max Usable: `{min(5, remaining)}` | Only one parameter adjustable**")
-        all_params = [p for group in config.parameter_groups.values() for p in group if p not in ["Alignment_China"]]
+        st.markdown(f"**💻 Remaining Points: `{remaining}` | Max Usable: `{min(engine.MAX_ADJUSTMENT, remaining)}` | Only one parameter adjustable**")
+        all_params = [p for p in utils.POLICY_PARAMS if p not in ["Alignment_China"]]
         
         selected_param = st.selectbox("Choose ONE parameter to adjust", all_params, key="adjust_select")
-        current_val = st.session_state.get(f"hidden_params_{selected_param}", 0)
-
-        # Determine range based on rules
-        delta_cap = min(5, remaining)
-        max_val = min(10, current_val + delta_cap)
-        min_val = max(0, current_val - delta_cap)
-
-    # Special case for Alignment_US/China
-    if selected_param == "Alignment_US":
-        current_cn = st.session_state.get("hidden_params_Alignment_China", 0)
-        new_val = st.slider("New Alignment_US value", 0, 10, current_val)
-        new_cn = 10 - new_val
-        st.markdown(f"➡️ Alignment_China will automatically adjust to: `{new_cn}`")
-    else:
-        new_val = st.slider(f"New value for {selected_param}", min_val, max_val, current_val)
+        current_val = current_hidden[selected_param]
+
+        # Determine range based on rules (engine.adjustment_range)
+        min_val, max_val = engine.adjustment_range(current_hidden, selected_param)
+
+        # Special case for Alignment_US/China
+        if selected_param == "Alignment_US":
+            new_val = st.slider("New Alignment_US value", min_val, max_val, current_val)
+            new_cn = 10 - new_val
+            st.markdown(f"➡️ Alignment_China will automatically adjust to: `{new_cn}`")
+        else:
+            new_val = st.slider(f"New value for {selected_param}", min_val, max_val, current_val)
+
+        # 조정 미리보기: 바뀐 파라미터를 읽는 성장률 항과 국내 이벤트 수식만 다시 계산합니다 (rescore.py).
+        if "adjustment_scorer" not in st.session_state:
+            st.session_state["adjustment_scorer"] = rescore.RoundScorer(
+                team, {**current_hidden, **config.fixed_values[team]}, store.load_cooperation(team, game) or {},
+                config.domestic_events[st.session_state.event_result], None, {}
+            )
+        scorer = st.session_state["adjustment_scorer"]
+        preview_hidden = engine.apply_adjustment(current_hidden, selected_param, new_val)
+        preview = scorer.with_changes({k: v for k, v in preview_hidden.items() if v != current_hidden[k]})
+        st.caption(
+            f"📈 Preview — paper growth: `{scorer.growth}` → `{preview.growth}` per round | "
+            f"domestic event: papers `{scorer.domestic['delta_papers']:+}` → `{preview.domestic['delta_papers']:+}`, "
+            f"models `{scorer.domestic['delta_models']:+}` → `{preview.domestic['delta_models']:+}`"
+        )
 
         if st.button("✅ Confirm Final Adjustment"):
-            # ( ... 기존 코드의 파라미터 저장 로직 ... )
+            adjusted = engine.apply_adjustment(current_hidden, selected_param, new_val)
+            for k, v in adjusted.items():
+                st.session_state[f"hidden_params_{k}"] = v
+
+            full_hidden_params = {**adjusted, **config.fixed_values[team]}
+            store.save_hidden(team, full_hidden_params, game)
+            st.session_state["growth_rate"] = engine.growth_rate(team, full_hidden_params)
+
             st.session_state.adjustment_confirmed = True
             st.success("✅ Adjustment saved. This concludes your policy modification for this round.")
             time.sleep(1)
@@ -281,23 +319,19 @@ if st.session_state.adjustment_confirmed:
     st.markdown("While domestic reforms were unfolding, a new wave of **international events** emerged...")
 
     # --- 여기가 수정된 로직 ---
-    # 국제 이벤트가 세션에 아직 로드되지 않았다면, 파일에서 로드하거나 새로 생성합니다.
+    # 국제 이벤트가 세션에 아직 로드되지 않았다면, 이번 라운드의 추첨 결과를 가져옵니다.
+    # 가장 먼저 도착한 팀만 추첨하고 (store.draw_once), 나머지 팀은 확정된 결과를 그대로 받습니다.
     if "international_events" not in st.session_state:
-        event_file = config.shared_dir / "international.json"
-
-        # 1. 파일이 이미 존재하는지 확인
-        if event_file.exists():
-            # 파일이 있다면, 두 번째 이후의 팀이므로 파일을 읽습니다.
-            with open(event_file, "r") as f:
-                chosen_events = json.load(f)
-                st.write("Previously determined international events have been loaded.")
-
-        # 2. 파일이 존재하지 않는 경우
+        chosen_events, drawn_here = store.draw_international(
+            lambda: random.sample(config.international_events, engine.INTERNATIONAL_EVENTS_PER_ROUND),
+            game
+        )
+
+        if not drawn_here:
+            # 두 번째 이후의 팀
+            st.write("Previously determined international events have been loaded.")
         else:
-            # 파일이 없다면, 첫 번째 팀이므로 이벤트를 새로 생성하고 저장합니다.
-            chosen_events = random.sample(config.international_events, 2)
-            with open(event_file, "w") as f:
-                json.dump(chosen_events, f)
+            # 첫 번째 팀
             st.write("Your team was the first to trigger the international events for this round!")
 
         # 결정된 이벤트를 현재 세션에 저장합니다.
@@ -315,4 +349,7 @@ if st.session_state.adjustment_confirmed:
 
 
     if st.button("➡️ Proceed to Summary Phase"):
-        st.switch_page("pages/5_Summary.py")
\ No newline at end of file
+        st.switch_page("pages/5_Summary.py")
+
+instrument.overlay()
+instrument.finish()
@@ -1,13 +1,35 @@
 # pages/5_Summary.py
 import streamlit as st
-import json
 import random
-import pandas as pd
-import plotly.graph_objects as go
+import charts
 import config
+import engine
+import instrument
+import store
 import utils
 
 st.set_page_config(layout="centered", page_title="Round Summary")
+instrument.start_page("Summary")
+
+# pandas / plotly는 표와 그래프를 실제로 그릴 때만 로드합니다 (콜드 스타트 시간 절약). 그래프는 charts.py.
+def leaderboard_frame(all_results):
+    import pandas as pd
+
+    leaderboard_data = []
+    for name, data in all_results.items():
+        leaderboard_data.append({
+            "Country": f"{config.country_flags.get(name, '🇺🇳')} {name}",
+            "Papers": data['papers'],
+            "Models": data['models'],
+            "Paper Growth": f"+{data['paper_delta']}" if data['paper_delta'] >= 0 else str(data['paper_delta']),
+            "Model Growth": f"+{data['model_delta']:.2f}" if data['model_delta'] >= 0 else f"{data['model_delta']:.2f}",
+        })
+
+    df = pd.DataFrame(leaderboard_data)
+    df = df.sort_values(by=["Models", "Papers"], ascending=False).reset_index(drop=True)
+    df.index = df.index + 1
+    df.index.name = "Rank"
+    return df
 
 # --- 로그인 확인 ---
 if not st.session_state.get("authenticated_team"):
@@ -17,6 +39,7 @@ if not st.session_state.get("authenticated_team"):
     st.stop()
 
 my_team = st.session_state.get("authenticated_team")
+game = st.session_state.get("game_id", store.DEFAULT_GAME)
 
 st.title("📊 Round Summary & Leaderboard")
 st.markdown("""
@@ -41,52 +64,20 @@ st.markdown("---")
 # --- 유일한 데이터 계산 로직 ---
 
 # 1. 기록 및 초기 데이터 로드
-history = utils.load_history()
-current_round_num = len(history) + 1
+current_round_num = store.current_round(game)
 st.header(f"🏁 End of Round {current_round_num}")
 
-if history:
-    initial_scores = history[-1]['scores']
-else:
-    initial_scores = {name: data for name, data in config.initial_data.items()}
-
-# 2. 모든 국가의 현재 라운드 결과 계산
-all_results = {}
-for name in config.team_credentials.keys():
-    growth = st.session_state.get('growth_rate', 0) if name == my_team else 0
-    (final_p, final_m), details = utils.calculate_round_results(
-        name,
-        initial_scores.get(name, {}).get('papers', 0),
-        initial_scores.get(name, {}).get('models', 0),
-        growth
-    )
-    all_results[name] = {
-        'papers': int(final_p),
-        'models': int(final_m),
-        'paper_delta': int(details.get('total_paper_delta', 0)),
-        'model_delta': float(details.get('total_model_delta', 0)),
-        'delta_details': details  # 상세 내역 저장
-    }
-
-
-# 3. 미국, 중국 데이터 업데이트
-us_papers_initial, us_models_initial = initial_scores.get('United States', {}).get('papers', 0), initial_scores.get('United States', {}).get('models', 0)
-us_delta = random.randint(150, 250)
-us_papers_final = us_papers_initial + us_delta
-us_models_final = utils.calculate_ai_models(us_papers_final)
-all_results['United States'] = {
-    'papers': us_papers_final, 'models': int(us_models_final),
-    'paper_delta': us_delta, 'model_delta': us_models_final - us_models_initial
-}
+# 이번 라운드를 이미 저장했더라도 시작 점수는 직전 라운드의 기록에서 가져옵니다.
+initial_scores = utils.initial_scores_for(current_round_num, game)
 
-cn_papers_initial, cn_models_initial = initial_scores.get('China', {}).get('papers', 0), initial_scores.get('China', {}).get('models', 0)
-cn_delta = random.randint(200, 300)
-cn_papers_final = cn_papers_initial + cn_delta
-cn_models_final = utils.calculate_ai_models(cn_papers_final)
-all_results['China'] = {
-    'papers': cn_papers_final, 'models': int(cn_models_final),
-    'paper_delta': cn_delta, 'model_delta': cn_models_final - cn_models_initial
-}
+# 2. 모든 국가의 현재 라운드 결과 계산 (국제 이벤트는 팀 × 파트너 × 이벤트를 한 번에 평가)
+growth_rates = {my_team: st.session_state.get('growth_rate', 0)}
+with instrument.phase("scoring"):
+    round_results = utils.calculate_all_round_results(initial_scores, growth_rates, game=game, round=current_round_num)
+    all_results = engine.round_summary(round_results)
+
+    # 3. 미국, 중국 데이터 업데이트
+    all_results.update(engine.update_superpowers(initial_scores, random))
 
 
 # --- UI 렌더링 ---
@@ -138,21 +129,9 @@ st.markdown("---")
 
 # 3. 기능 1: 랭킹 리더보드
 st.header("🏆 Leaderboard")
-leaderboard_data = []
-for name, data in all_results.items():
-    leaderboard_data.append({
-        "Country": f"{config.country_flags.get(name, '🇺🇳')} {name}",
-        "Papers": data['papers'],
-        "Models": data['models'],
-        "Paper Growth": f"+{data['paper_delta']}" if data['paper_delta'] >= 0 else str(data['paper_delta']),
-        "Model Growth": f"+{data['model_delta']:.2f}" if data['model_delta'] >= 0 else f"{data['model_delta']:.2f}",
-    })
-
-df = pd.DataFrame(leaderboard_data)
-df = df.sort_values(by=["Models", "Papers"], ascending=False).reset_index(drop=True)
-df.index = df.index + 1
-df.index.name = "Rank"
-st.dataframe(df, use_container_width=True)
+with instrument.phase("leaderboard"):
+    df = leaderboard_frame(all_results)
+    st.dataframe(df, use_container_width=True)
 
 
 # 4. 기능 2: 누적 성장 그래프
@@ -161,114 +140,24 @@ st.header("📈 Cumulative Growth Trend (Models)")
 # 탭을 사용하여 모델 수와 논문 수 그래프 분리
 tab1, tab2 = st.tabs(["🪄 Models Growth", "📄 Papers Growth"])
 
-# 라운드 0(초기값) 데이터 생성
-round_0_data_models = {'round': 0}
-round_0_data_papers = {'round': 0}
-
-initial_player_sum_models = 0
-initial_player_sum_papers = 0
-
-for name, data in config.initial_data.items():
-    round_0_data_models[name] = data['models']
-    round_0_data_papers[name] = data['papers']
-    if name in config.team_credentials:
-        initial_player_sum_models += data['models']
-        initial_player_sum_papers += data['papers']
-
-round_0_data_models['4 Players Sum'] = initial_player_sum_models
-round_0_data_papers['4 Players Sum'] = initial_player_sum_papers
-
-# 차트 데이터 리스트에 라운드 0을 먼저 추가
-chart_data_models = [round_0_data_models]
-chart_data_papers = [round_0_data_papers]
-
-# 현재까지의 기록을 차트 데이터에 추가
+# 현재 라운드 기록 (저장 버튼에서 사용)
 new_round_to_save = {
     "round": current_round_num,
     "scores": all_results
 }
-current_history = history + [new_round_to_save]
-
-for round_data in current_history:
-    round_num = round_data['round']
-    scores = round_data['scores']
-    
-    row_models = {'round': round_num}
-    row_papers = {'round': round_num}
-    
-    player_sum_models, player_sum_papers = 0, 0
-    for name in config.team_credentials.keys():
-        row_models[name] = scores.get(name, {}).get('models', 0)
-        row_papers[name] = scores.get(name, {}).get('papers', 0)
-        player_sum_models += row_models[name]
-        player_sum_papers += row_papers[name]
-        
-    row_models['United States'] = scores.get('United States', {}).get('models', 0)
-    row_papers['United States'] = scores.get('United States', {}).get('papers', 0)
-    row_models['China'] = scores.get('China', {}).get('models', 0)
-    row_papers['China'] = scores.get('China', {}).get('papers', 0)
-    row_models['4 Players Sum'] = player_sum_models
-    row_papers['4 Players Sum'] = player_sum_papers
-    
-    chart_data_models.append(row_models)
-    chart_data_papers.append(row_papers)
-
-# --- Models Growth 탭 ---
-with tab1:
-    if chart_data_models:
-        df_models = pd.DataFrame(chart_data_models).set_index('round')
-        
-        # 범례 순서 지정
-        legend_order = ["United States", "China", "4 Players Sum", "Korea", "Japan", "Mongolia", "Taiwan"]
-        df_models = df_models[legend_order]
-        
-        # Plotly 그래프 생성
-        fig_models = go.Figure()
-        for country in df_models.columns:
-            fig_models.add_trace(go.Scatter(x=df_models.index, y=df_models[country],
-                                            mode='lines+markers', name=country))
-        
-        # X축 범위와 틱(tick) 설정
-        fig_models.update_layout(
-            xaxis=dict(
-                title="Round",
-                range=[0, current_round_num + 2],  # 현재 라운드 + 2 만큼 여유 공간
-                tickmode='linear',
-                tick0=0,
-                dtick=1  # 1단위로 정수 틱만 표시
-            ),
-            yaxis_title="Number of Models",
-            legend_title="Country"
-        )
+
+# 기록된 라운드는 charts.growth_series가 NumPy 배열로 캐시하고, 새로 저장된 라운드만 덧붙입니다.
+with instrument.phase("charts"):
+    series = charts.growth_series(game)
+
+    # --- Models Growth 탭 ---
+    with tab1:
+        fig_models = charts.growth_figure(series, current_round_num, all_results, "models", "Number of Models")
         st.plotly_chart(fig_models, use_container_width=True)
 
-# --- Papers Growth 탭 ---
-with tab2:
-    if chart_data_papers:
-        df_papers = pd.DataFrame(chart_data_papers).set_index('round')
-        
-        # 범례 순서 지정
-        legend_order = ["United States", "China", "4 Players Sum", "Korea", "Japan", "Mongolia", "Taiwan"]
-        df_papers = df_papers[legend_order]
-        
-        # Plotly 그래프 생성
-        fig_papers = go.Figure()
-        for country in df_papers.columns:
-            fig_papers.add_trace(go.Scatter(x=df_papers.index, y=df_papers[country],
-                                            mode='lines+markers', name=country))
-                                            
-        # X축 범위와 틱(tick) 설정
-        fig_papers.update_layout(
-            xaxis=dict(
-                title="Round",
-                range=[0, current_round_num + 2],
-                tickmode='linear',
-                tick0=0,
-                dtick=1
-            ),
-            yaxis_title="Number of Papers",
-            legend_title="Country"
-        )
+    # --- Papers Growth 탭 ---
+    with tab2:
+        fig_papers = charts.growth_figure(series, current_round_num, all_results, "papers", "Number of Papers")
         st.plotly_chart(fig_papers, use_container_width=True)
 
 # 5. 기능 3: 이번 라운드 국제 이벤트
@@ -276,24 +165,22 @@ st.header("🔔 Events This Round")
 
 # 플레이어의 Domestic Event 표시
 st.subheader(f"Domestic Event in {my_team}")
-try:
-    with open(config.shared_dir / f"domestic_{my_team}.json", "r") as f:
-        domestic_event = json.load(f)
+domestic_event = store.load_domestic(my_team, game, current_round_num)
+if domestic_event is not None:
     st.markdown(f"**{domestic_event['title']}**")
     st.write(domestic_event['description'])
-except FileNotFoundError:
-    st.warning(f"Your domestic event file was not found.")
+else:
+    st.warning(f"Your domestic event was not found.")
 
 # 국제 이벤트 표시
 st.subheader("International Events (Applied to all nations)")
-try:
-    with open(config.shared_dir / "international.json", "r") as f:
-        international_events = json.load(f)
+international_events = store.load_international(game, current_round_num)
+if international_events is not None:
     for i, event in enumerate(international_events, 1):
         st.markdown(f"**{i}. {event['title']}**")
         st.write(event['description'])
-except FileNotFoundError:
-    st.warning("International events file not found for this round.")
+else:
+    st.warning("International events not found for this round.")
 
 
 # --- 라운드 종료 및 다음 라운드 시작 버튼 ---
@@ -301,36 +188,26 @@ st.markdown("---")
 
 # 현재 라운드 기록을 저장하는 버튼
 if st.button("End Round and Save History"):
-    utils.save_history(new_round_to_save)
-    st.success(f"Round {current_round_num} has been successfully recorded. Proceed to the next round.")
+    if utils.save_history(new_round_to_save, game):
+        st.success(f"Round {current_round_num} has been successfully recorded. Proceed to the next round.")
+    else:
+        st.info(f"Round {current_round_num} was already recorded. Proceed to the next round.")
     #st.balloons()
 
 # 다음 라운드를 시작하는 버튼
 if st.button("🚀 Start Next Round"):
-    # 1. 이번 라운드에서 생성된 공유 파일들을 삭제하여 초기화합니다.
-    st.toast("Clearing data for the new round...")
-    
-    # 국제 이벤트 파일 삭제
-    international_event_file = config.shared_dir / "international.json"
-    if international_event_file.exists():
-        international_event_file.unlink()
-
-    # 모든 플레이어의 국내 이벤트 및 협력 파일 삭제
-    for country_name in config.team_credentials.keys():
-        domestic_file = config.shared_dir / f"domestic_{country_name}.json"
-        if domestic_file.exists():
-            domestic_file.unlink()
-
-        coop_file = config.shared_dir / f"cooperation_{country_name}.json"
-        if coop_file.exists():
-            coop_file.unlink()
+    # 1. 게임을 다음 라운드로 넘깁니다. 공유 상태는 라운드별로 저장되므로 삭제할 파일이 없고,
+    #    여러 팀이 동시에 눌러도 라운드는 한 번만 증가합니다.
+    st.toast("Preparing the new round...")
+    store.advance_round(game, current_round_num)
             
     # 2. 라운드별로 초기화가 필요한 session_state 변수들을 삭제합니다.
     keys_to_clear = [
         "rolling", "event_result", "event_shown", "intel_shown",
         "adjustment_confirmed", "international_events", "cooperation_state",
         "intel_step1_result_value", "intel_result_step2", "intel_result_step3", "intel_result_step4",
-        "intel_shown_step2", "intel_shown_step3", "intel_shown_step4"
+        "intel_shown_step2", "intel_shown_step3", "intel_shown_step4", "intel_snapshot",
+        "adjustment_scorer"
     ]
     for key in keys_to_clear:
         if key in st.session_state:
@@ -339,3 +216,6 @@ if st.button("🚀 Start Next Round"):
     # 3. Policy 페이지로 이동하여 새 라운드를 시작합니다.
     st.success("Starting new round... Navigating to Policy Phase!")
     st.switch_page("pages/2_Policy.py")
+
+instrument.overlay()
+instrument.finish()
@@ -0,0 +1,79 @@
+# projection.py
+# Policy 페이지의 what-if 예측: 지금 슬라이더로 성장률, 앞으로 N라운드의 예상 논문/모델 수,
+# 이번 라운드 이벤트 추첨에 따른 위험 (outcomes.py로 정확히)을 계산합니다.
+# 협력 합의는 없다고 보고 (협력 단계는 나중), 매 라운드 평균적인 이벤트가 나온다고 가정합니다.
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+import config
+import engine
+import outcomes
+import utils
+
+
+@dataclass
+class Projection:
+    hidden: dict          # 계산에 쓴 슬라이더 값 (고정값 포함)
+    deltas: tuple         # outcomes.event_deltas(hidden, 합의 없는 협력)
+    growth: int
+    rounds: np.ndarray    # 0..N
+    papers: np.ndarray    # 라운드별 예상 논문 수 (0 = 지금)
+    models: np.ndarray    # 라운드별 예상 모델 수
+    exposure: dict        # 이번 라운드 이벤트 추첨: 평균 / p5 / p95 / 손실 확률 / 최악의 추첨
+
+
+class Projector:
+    def __init__(self, team: str):
+        self.team = team
+        self.fixed = config.fixed_values[team]
+        self.multipliers = utils.growth_multipliers(self.fixed)
+        self.cooperation = {p: engine.default_cooperation() for p in config.team_credentials if p != team}
+
+    def growth(self, hidden: dict) -> int:
+        """팀 배율을 미리 계산해 둔 utils.compute_growth_rate."""
+        terms = {name: term(hidden) for name, (_, term) in utils.GROWTH_TERMS.items()}
+        return utils.combine_growth(terms, self.multipliers)
+
+    def project(self, sliders: dict, start: dict, rounds: int, previous: Projection = None) -> Projection:
+        """
+        sliders: Policy 페이지 값, start: 지금의 {'papers', 'models'}.
+        previous는 이 세션의 직전 예측으로, 그 이벤트별 변화량을 증분으로 갱신합니다.
+        """
+        hidden = {**sliders, **self.fixed}
+        if previous is None:
+            deltas = outcomes.cached_event_deltas(hidden, self.cooperation)
+        else:
+            deltas = outcomes.update_event_deltas(previous.deltas, previous.hidden, hidden, self.cooperation)
+        domestic, international = deltas
+        growth = self.growth(hidden)
+        papers0, models0 = start.get('papers', 0), start.get('models', 0)
+
+        dist = outcomes.combine(domestic, international, papers0, growth)
+        k = engine.INTERNATIONAL_EVENTS_PER_ROUND
+        # 매 라운드 평균적인 이벤트: 논문 증가량은 정확한 기댓값, 모델은 이벤트의 직접 효과 + 논문에서 나오는 모델
+        paper_step = dist.mean("papers")
+        direct_models = domestic[:, 1].mean() + k * international[:, 1].mean()
+        steps = np.arange(rounds + 1)
+        papers = papers0 + steps * paper_step
+        from_papers = utils.calculate_ai_models(papers)
+        models = models0 + steps * direct_models + (from_papers - from_papers[0])
+
+        p5, p95 = dist.quantile("papers", [0.05, 0.95])
+        m5, m95 = dist.quantile("models", [0.05, 0.95])
+        worst = dist.extremes("papers", 1)["worst"][0]
+        exposure = {
+            "event_papers": paper_step - growth,
+            "event_models": float(direct_models),
+            "papers_p5": int(p5), "papers_p95": int(p95),
+            "models_p5": float(m5), "models_p95": float(m95),
+            "prob_paper_loss": dist.prob_loss("papers"),
+            "worst": worst,
+        }
+        return Projection(hidden, deltas, growth, steps, papers, models, exposure)
+
+
+@lru_cache(maxsize=None)
+def projector(team: str) -> Projector:
+    return Projector(team)
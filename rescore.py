@@ -0,0 +1,167 @@
+# rescore.py
+# 최종 정책 조정 미리보기용 증분 점수 계산
+# 슬라이더 하나(Alignment_US/China는 둘)를 바꾸면 그 파라미터를 읽는 성장 항과 수식만 다시 평가합니다.
+# 결과는 전체 재계산과 같습니다 (python rescore.py --samples 2000 으로 확인).
+import argparse
+import copy
+import random
+
+import config
+import formulas
+import utils
+
+
+def _reads(expr: str) -> frozenset:
+    try:
+        return formulas.free_variables(expr)
+    except formulas.FormulaError:
+        return frozenset()   # 거부된 수식은 항상 0
+
+
+class RoundScorer:
+    """
+    한 팀의 라운드를 부분별로 계산합니다. international_events가 None (아직 추첨 전)이면
+    result()는 score_all_teams처럼 시작 점수를 주고, 성장률과 국내 변화량은 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, team, hidden, cooperation, domestic_event, international_events, initial_scores):
+        self.team = team
+        self.hidden = dict(hidden)
+        self.cooperation = cooperation
+        self.domestic_event = domestic_event
+        self.international_events = international_events
+        self.initial = initial_scores.get(team, {})
+        self.multipliers = utils.growth_multipliers(config.fixed_values[team])
+        self.evaluated = 0
+
+        self.terms = {}
+        for name in utils.GROWTH_TERMS:
+            self._term(name)
+        self.domestic = {}
+        for field in formulas.FIELDS:
+            self._domestic(field)
+        self.international = {}
+        if international_events is not None:
+            self.partners = utils.international_partners({team: cooperation}, [team])
+            self._international([(e, f) for e in range(len(international_events)) for f in formulas.FIELDS])
+
+    # --- 부분 ---
+
+    def _term(self, name):
+        self.evaluated += 1
+        try:
+            self.terms[name] = utils.GROWTH_TERMS[name][1](self.hidden)
+        except Exception:
+            self.terms[name] = None   # compute_growth_rate가 None을 돌려주는 경우
+
+    def _domestic(self, field):
+        self.evaluated += 1
+        self.domestic[field] = utils.evaluate_delta(self.domestic_event[field], self.hidden)
+
+    def _international(self, cells):
+        """(이벤트 인덱스, 필드) 칸을 다시 평가합니다 (score_all_teams처럼 파트너 합계)."""
+        exprs = [self.international_events[e][field] for e, field in cells]
+        totals = utils.evaluate_international_exprs(exprs, {self.team: self.hidden}, {self.team: self.cooperation},
+                                                    [self.team], self.partners)[0].sum(axis=1)
+        self.evaluated += len(cells)
+        for cell, total in zip(cells, totals):
+            self.international[cell] = int(total)
+
+    # --- 결과 ---
+
+    @property
+    def growth(self):
+        """utils.compute_growth_rate(hidden, fixed)와 같음 (계산할 수 없는 항이 있으면 None)."""
+        if any(v is None for v in self.terms.values()):
+            return None
+        return utils.combine_growth(self.terms, self.multipliers)
+
+    def international_total(self, field) -> int:
+        return sum(v for (_, f), v in self.international.items() if f == field)
+
+    def result(self):
+        """((papers, models), details). utils.score_all_teams(...)[team]과 같습니다."""
+        if self.international_events is None:
+            return (self.initial.get('papers', 0), self.initial.get('models', 0)), {}
+        return utils.finish_round(
+            self.domestic["delta_papers"], self.domestic["delta_models"],
+            self.international_total("delta_papers"), self.international_total("delta_models"),
+            self.initial.get('papers', 0), self.initial.get('models', 0), self.growth
+        )
+
+    def with_changes(self, changes: dict) -> "RoundScorer":
+        """changes를 반영한 새 scorer. 바뀐 파라미터를 읽는 부분만 다시 평가합니다."""
+        new = copy.copy(self)
+        new.hidden = {**self.hidden, **changes}
+        new.terms, new.domestic, new.international = dict(self.terms), dict(self.domestic), dict(self.international)
+        new.evaluated = 0
+        changed = set(changes)
+
+        for name, (params, _) in utils.GROWTH_TERMS.items():
+            if changed.intersection(params):
+                new._term(name)
+        for field in formulas.FIELDS:
+            if changed & _reads(self.domestic_event[field]):
+                new._domestic(field)
+        if self.international_events is not None:
+            cells = [(e, f) for e, event in enumerate(self.international_events) for f in formulas.FIELDS
+                     if changed & _reads(event[f])]
+            if cells:
+                new._international(cells)
+        return new
+
+
+# --- 검증 ---
+
+def check(samples: int = 1000, seed: int = 0) -> dict:
+    """무작위 라운드와 조정으로 증분 결과가 utils.score_all_teams와 같은지 확인합니다 (다르면 AssertionError)."""
+    import engine
+    import simulate
+
+    rng = random.Random(seed)
+    teams = engine.PLAYER_TEAMS
+    adjustable = [p for p in utils.POLICY_PARAMS if p != "Alignment_China"]
+    evaluated = {"incremental": 0, "full": 0}
+    for i in range(samples):
+        decisions = simulate.sample_decisions(rng, teams)
+        hidden = {t: engine.build_hidden(t, decisions[t].policy) for t in teams}
+        cooperation = engine.settle_cooperation({t: decisions[t].cooperation for t in teams}, hidden)
+        domestic = {t: config.domestic_events[engine.draw_domestic_event(rng)] for t in teams}
+        events = [config.international_events[e] for e in engine.draw_international_events(rng)]
+        initial = config.initial_data
+
+        team = rng.choice(teams)
+        param = rng.choice(adjustable)
+        low, high = engine.adjustment_range(hidden[team], param)
+        adjusted = engine.apply_adjustment(hidden[team], param, rng.randint(low, high))
+        changes = {k: v for k, v in adjusted.items() if v != hidden[team][k]}
+
+        scorer = RoundScorer(team, hidden[team], cooperation[team], domestic[team], events, initial)
+        preview = scorer.with_changes(changes)
+
+        hidden[team] = adjusted
+        growth = {t: utils.compute_growth_rate(hidden[t], config.fixed_values[t]) for t in teams}
+        inputs = {t: (hidden[t], cooperation[t], domestic[t]) for t in teams}
+        expected = utils.score_all_teams(inputs, events, initial, growth)[team]
+        assert preview.result() == expected, f"sample {i}: {team} {changes}: {preview.result()} != {expected}"
+        assert preview.growth == growth[team], f"sample {i}: growth {preview.growth} != {growth[team]}"
+
+        evaluated["incremental"] += preview.evaluated
+        evaluated["full"] += scorer.evaluated
+    return evaluated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check incremental rescoring against a full recompute.")
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    evaluated = check(args.samples, args.seed)
+    share = evaluated["incremental"] / evaluated["full"]
+    print(f"{args.samples} adjustments: identical to a full recompute; "
+          f"{evaluated['incremental']} of {evaluated['full']} terms/formulas re-evaluated ({share:.0%})")
+
+
+if __name__ == "__main__":
+    main()
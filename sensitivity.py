@@ -0,0 +1,196 @@
+# sensitivity.py
+# 점수 수식의 분산 기반 민감도 분석 (Sobol S1 / ST, Saltelli·Jansen 추정)
+#   python sensitivity.py --team Korea --samples 4096 --workers 8 --seed 0 --out sensitivity.json
+# 요인 25개: 독립 정책 슬라이더 15개 (Alignment_China = 10 - Alignment_US) + 협력 파라미터 10개 (세 파트너에 같게)
+# 예산을 넘는 표본은 정해진 규칙으로 예산 안에 맞춥니다 (decode 참고).
+# 모든 출력에서 ST가 --dead 미만인 요인은 dead weight로 보고합니다.
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import config
+import engine
+import formulas
+import utils
+
+POLICY_FACTORS = [p for p in utils.POLICY_PARAMS if p != "Alignment_China"]
+COOP_FACTORS = list(config.coop_params)
+FACTORS = POLICY_FACTORS + COOP_FACTORS
+LEVELS = {p: list(range(11)) for p in POLICY_FACTORS}
+LEVELS.update({k: ["No", "Yes"] if v["type"] == "bool" else list(v["options"]) for k, v in config.coop_params.items()})
+PARTNERS = len(config.team_credentials) - 1
+FREE_BUDGET = utils.POLICY_BUDGET - 10   # Alignment_US + Alignment_China
+CHUNK = 4096
+
+
+# --- 벡터화 점수 계산 ---
+
+def decode(levels: np.ndarray, team: str):
+    """
+    수준 인덱스 (n x 요인) -> 예산 안의 (hidden 열, hidden + 협력 열).
+    정책은 90포인트를 넘으면 비율대로 줄이고(내림), 협력은 카탈로그 순서대로 한도를 넘는 것부터 "No"/"None".
+    """
+    n = len(levels)
+    policy = {p: levels[:, i].astype(np.int64) for i, p in enumerate(POLICY_FACTORS)}
+    free = [p for p in POLICY_FACTORS if p != "Alignment_US"]
+    used = sum(policy[p] for p in free)
+    over = used > FREE_BUDGET
+    for p in free:
+        policy[p] = np.where(over, policy[p] * FREE_BUDGET // np.maximum(used, 1), policy[p])
+    policy["Alignment_China"] = 10 - policy["Alignment_US"]
+
+    hidden = formulas.Columns()
+    hidden.update(policy)
+    for k, v in config.fixed_values[team].items():
+        hidden[k] = np.full(n, v, dtype=object if isinstance(v, str) else float)
+
+    limit = 20 + policy["Willing_to_Cooperate"]
+    spent = np.zeros(n, dtype=np.int64)
+    fits = np.ones(n, dtype=bool)
+    combined = formulas.Columns()
+    combined.update(hidden)
+    for i, k in enumerate(COOP_FACTORS, start=len(POLICY_FACTORS)):
+        meta = config.coop_params[k]
+        raw = np.array(LEVELS[k], dtype=object)[levels[:, i]]
+        active = (raw != "None") & (raw != "No")
+        spent = spent + np.where(active, meta["points"] * PARTNERS, 0)
+        fits &= spent <= limit   # 카탈로그 순서대로, 한도를 처음 넘는 파라미터부터는 모두 제외
+        raw = np.where(active & ~fits, "No" if meta["type"] == "bool" else "None", raw)
+        # utils.process_coop_params와 같은 변환
+        if meta["type"] == "bool":
+            combined[k] = (raw == "Yes").astype(np.int64)
+        else:
+            combined[k] = np.where(raw == "None", None, raw)
+    return hidden, combined
+
+
+def output_names() -> list:
+    names = ["growth", "round_papers", "round_models"]
+    names += [formulas.formula_id("domestic", eid, f) for eid in config.domestic_events for f in formulas.FIELDS]
+    names += [formulas.formula_id("international", idx, f)
+              for idx in range(len(config.international_events)) for f in formulas.FIELDS]
+    return names
+
+
+def score(levels: np.ndarray, team: str) -> np.ndarray:
+    """(n x 요인) 수준 인덱스 -> (n x 출력) 배열. 열 순서는 output_names()."""
+    n = len(levels)
+    hidden, combined = decode(levels, team)
+    shape = (n,)
+
+    multipliers = utils.growth_multipliers(config.fixed_values[team])
+    terms = {name: term(hidden) for name, (_, term) in utils.GROWTH_TERMS.items()}
+    labor_term, nat, gdp = multipliers
+    growth = np.rint(4 * ((terms["tech"] * terms["human"] + terms["cultural"]) * labor_term * nat * gdp))
+
+    domestic = np.stack([formulas.evaluate_batch(e[f], hidden, shape)
+                         for e in config.domestic_events.values() for f in formulas.FIELDS], axis=1)
+    international = PARTNERS * np.stack([formulas.evaluate_batch(e[f], combined, shape)
+                                         for e in config.international_events for f in formulas.FIELDS], axis=1)
+
+    k = engine.INTERNATIONAL_EVENTS_PER_ROUND
+    papers = growth + domestic[:, 0::2].mean(axis=1) + k * international[:, 0::2].mean(axis=1)
+    start = config.initial_data[team]["papers"]
+    from_papers = utils.calculate_ai_models(start + papers) - utils.calculate_ai_models(start)
+    models = from_papers + domestic[:, 1::2].mean(axis=1) + k * international[:, 1::2].mean(axis=1)
+    return np.column_stack([growth, papers, models, domestic, international]).astype(float)
+
+
+# --- Sobol 지수 ---
+
+def sample(samples: int, seed: int):
+    """Saltelli 설계: A, B, 요인 i마다 i열만 B에서 가져온 A ((요인 + 2) x samples 행)."""
+    rng = np.random.default_rng(seed)
+    sizes = np.array([len(LEVELS[f]) for f in FACTORS])
+    a = rng.integers(0, sizes, size=(samples, len(FACTORS)))
+    b = rng.integers(0, sizes, size=(samples, len(FACTORS)))
+    blocks = [a, b] + [np.where(np.arange(len(FACTORS)) == i, b, a) for i in range(len(FACTORS))]
+    return np.concatenate(blocks)
+
+
+def sobol_indices(y: np.ndarray, samples: int):
+    """y: ((요인 + 2) * samples) x 출력 -> (S1, ST), 각각 요인 x 출력 (상수 출력은 NaN)."""
+    y = y.reshape(len(FACTORS) + 2, samples, -1)
+    f_a, f_b, f_ab = y[0], y[1], y[2:]
+    var = np.var(np.concatenate([f_a, f_b]), axis=0)
+    var = np.where(var > 0, var, np.nan)
+    s1 = np.mean(f_b * (f_ab - f_a), axis=1) / var              # Saltelli (2010)
+    st = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / var         # Jansen (1999)
+    return s1, st
+
+
+def analyze(team: str, samples: int = 2048, seed: int = 0, workers=None, dead: float = 0.01) -> dict:
+    """표본을 뽑아 (병렬 묶음으로) 계산하고 순위 보고서를 반환합니다."""
+    x = sample(samples, seed)
+    chunks = [x[i:i + CHUNK] for i in range(0, len(x), CHUNK)]
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        parts = [score(c, team) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(score, chunks, [team] * len(chunks)))
+    s1, st = sobol_indices(np.concatenate(parts), samples)
+    return report(s1, st, dead)
+
+
+def _ranking(s1, st, col, dead=0.0) -> list:
+    rows = [{"factor": f, "S1": round(float(s1[i, col]), 4), "ST": round(float(st[i, col]), 4)}
+            for i, f in enumerate(FACTORS) if st[i, col] >= dead]
+    return sorted(rows, key=lambda r: -r["ST"])
+
+
+def report(s1: np.ndarray, st: np.ndarray, dead: float) -> dict:
+    names = output_names()
+    overall = {name: _ranking(s1, st, c) for c, name in enumerate(names[:3])}
+    events, constant = {}, []
+    for c, name in enumerate(names[3:], start=3):
+        if np.isnan(st[:, c]).all():
+            constant.append(name)
+        else:
+            events[name] = _ranking(s1, st, c, dead)
+    max_st = np.nanmax(np.where(np.isnan(st), -np.inf, st), axis=1)
+    return {
+        "overall": overall,
+        "events": events,
+        "constant_outputs": constant,
+        "dead_weight": [f for f, m in zip(FACTORS, max_st) if m < dead],
+        "events_per_factor": {f: sum(1 for rows in events.values() for r in rows if r["factor"] == f) for f in FACTORS},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Variance-based sensitivity analysis of the scoring formulas.")
+    parser.add_argument("--team", choices=list(config.team_credentials), default=list(config.team_credentials)[0])
+    parser.add_argument("--samples", type=int, default=2048, help="base samples; (factors + 2) x this many are scored")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--dead", type=float, default=0.01, help="ST below this on every output = dead weight")
+    parser.add_argument("--out", default="sensitivity.json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = analyze(args.team, args.samples, args.seed, args.workers, args.dead)
+    elapsed = time.perf_counter() - start
+    result["run"] = {**vars(args), "seconds": round(elapsed, 1), "evaluations": (len(FACTORS) + 2) * args.samples}
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=4, ensure_ascii=False)
+
+    print(f"{args.team}: {(len(FACTORS) + 2) * args.samples} profiles scored in {elapsed:.1f}s -> {args.out}")
+    growth = {r["factor"]: r["ST"] for r in result["overall"]["growth"]}
+    models = {r["factor"]: r for r in result["overall"]["round_models"]}
+    print(f"{'factor':<34} {'papers S1':>9} {'ST':>6} {'models S1':>10} {'ST':>6} {'growth ST':>10} {'events':>7}")
+    for r in result["overall"]["round_papers"]:
+        f = r["factor"]
+        print(f"{f:<34} {r['S1']:>9.3f} {r['ST']:>6.3f} {models[f]['S1']:>10.3f} {models[f]['ST']:>6.3f} "
+              f"{growth.get(f, float('nan')):>10.3f} {result['events_per_factor'][f]:>7}")
+    print(f"\ndead weight (ST < {args.dead} on every output): {', '.join(result['dead_weight']) or 'none'}")
+    if result["constant_outputs"]:
+        print(f"constant outputs: {', '.join(result['constant_outputs'])}")
+
+
+if __name__ == "__main__":
+    main()
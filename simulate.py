@@ -0,0 +1,197 @@
+# simulate.py
+# 이벤트 밸런스 몬테카를로 시뮬레이터: 무작위 게임을 엔진으로 돌려 국가별/이벤트별 변화량 분위수를 냅니다.
+#   python simulate.py --games 100000 --rounds 10 --workers 8 --seed 0 --out balance.json
+# 게임은 고정 크기 묶음으로 나누고 묶음마다 --seed에서 파생한 시드를 쓰므로 결과는 워커 수와 무관합니다.
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import config
+import engine
+import utils
+
+CHUNK_GAMES = 50
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+MODEL_SCALE = 100  # 모델 변화량은 실수이므로 히스토그램에는 0.01 단위로
+
+
+# --- 샘플링 ---
+
+def sample_policy(rng) -> dict:
+    """균등한 슬라이더 값을 100포인트 예산에 맞을 때까지 한 포인트씩 줄입니다."""
+    policy = {p: rng.randint(0, 10) for p in utils.POLICY_PARAMS if p != "Alignment_China"}
+    policy["Alignment_China"] = 10 - policy["Alignment_US"]
+    over = utils.policy_points(policy) - utils.POLICY_BUDGET
+    trimmable = [p for p in policy if p not in ("Alignment_US", "Alignment_China")]
+    while over > 0:
+        p = rng.choice([p for p in trimmable if policy[p] > 0])
+        policy[p] -= 1
+        over -= 1
+    return policy
+
+
+def sample_cooperation(rng, teams: list, hidden: dict, agree_prob=0.3) -> dict:
+    """
+    양쪽이 합의한 협력만: (팀 쌍, 파라미터)를 무작위 순서로 한 번씩 보고,
+    두 팀 모두 포인트가 남아 있으면 agree_prob 확률로 합의합니다.
+    """
+    offers = {t: {p: engine.default_cooperation() for p in teams if p != t} for t in teams}
+    left = {t: utils.coop_limit(hidden[t]) for t in teams}
+    candidates = [(a, b, k) for i, a in enumerate(teams) for b in teams[i + 1:] for k in config.coop_params]
+    rng.shuffle(candidates)
+    for a, b, k in candidates:
+        meta = config.coop_params[k]
+        if rng.random() >= agree_prob or left[a] < meta["points"] or left[b] < meta["points"]:
+            continue
+        value = "Yes" if meta["type"] == "bool" else rng.choice([o for o in meta["options"] if o != "None"])
+        offers[a][b][k] = offers[b][a][k] = value
+        left[a] -= meta["points"]
+        left[b] -= meta["points"]
+    return offers
+
+
+def sample_decisions(rng, teams: list) -> dict:
+    policies = {t: sample_policy(rng) for t in teams}
+    hidden = {t: engine.build_hidden(t, policies[t]) for t in teams}
+    offers = sample_cooperation(rng, teams, hidden)
+    return {t: engine.TeamDecision(policy=policies[t], cooperation=offers[t]) for t in teams}
+
+
+# --- 집계 ---
+
+def _new_stats():
+    return {
+        "round_paper_delta": defaultdict(Counter),    # 국가 -> 히스토그램
+        "round_model_delta": defaultdict(Counter),    # 국가 -> 히스토그램 (x MODEL_SCALE)
+        "final_papers": defaultdict(Counter),
+        "final_models": defaultdict(Counter),
+        "domestic_paper": defaultdict(Counter),       # 이벤트 id -> 히스토그램
+        "domestic_model": defaultdict(Counter),
+        "international_paper": defaultdict(Counter), # 이벤트 인덱스 -> 히스토그램 (뽑힌 라운드만)
+        "international_model": defaultdict(Counter),
+    }
+
+
+def _merge(into, other):
+    for table, by_key in other.items():
+        for key, hist in by_key.items():
+            into[table][key].update(hist)
+
+
+def run_chunk(seed: int, games: int, rounds: int) -> dict:
+    """한 시드로 games번의 게임을 진행하고 히스토그램을 반환합니다."""
+    rng = random.Random(seed)
+    stats = _new_stats()
+    teams = engine.PLAYER_TEAMS
+    for _ in range(games):
+        state = engine.GameState()
+        for _ in range(rounds):
+            report = engine.play_round(state, sample_decisions(rng, teams), rng)
+            for name, data in report.results.items():
+                stats["round_paper_delta"][name][data["paper_delta"]] += 1
+                stats["round_model_delta"][name][round(data["model_delta"] * MODEL_SCALE)] += 1
+            # 국제 이벤트는 details에 두 이벤트의 합만 있으므로 이벤트별로 (파트너 합계) 다시 구합니다
+            per_event = utils.evaluate_international_batch(
+                [config.international_events[i] for i in report.international_events],
+                report.hidden, report.cooperation, teams=teams
+            ).sum(axis=2)
+            for t, team in enumerate(teams):
+                details = report.results[team]["delta_details"]
+                eid = report.domestic_events[team]
+                stats["domestic_paper"][eid][details["domestic_paper"]] += 1
+                stats["domestic_model"][eid][details["domestic_model"]] += 1
+                for e, idx in enumerate(report.international_events):
+                    stats["international_paper"][idx][int(per_event[t, e, 0])] += 1
+                    stats["international_model"][idx][int(per_event[t, e, 1])] += 1
+        for name, score in state.scores.items():
+            stats["final_papers"][name][score["papers"]] += 1
+            stats["final_models"][name][score["models"]] += 1
+    return stats
+
+
+def _summarize(hist: Counter, scale=1) -> dict:
+    values = np.array(sorted(hist), dtype=float)
+    counts = np.array([hist[v] for v in sorted(hist)], dtype=float)
+    cdf = np.cumsum(counts) / counts.sum()
+    out = {"n": int(counts.sum()), "mean": round(float((values * counts).sum() / counts.sum()) / scale, 3)}
+    for q in PERCENTILES:
+        out[f"p{q}"] = float(values[np.searchsorted(cdf, q / 100)]) / scale
+    return out
+
+
+def report(stats: dict) -> dict:
+    countries = {}
+    for name in stats["round_paper_delta"]:
+        countries[name] = {
+            "round_paper_delta": _summarize(stats["round_paper_delta"][name]),
+            "round_model_delta": _summarize(stats["round_model_delta"][name], MODEL_SCALE),
+            "final_papers": _summarize(stats["final_papers"][name]),
+            "final_models": _summarize(stats["final_models"][name]),
+        }
+    domestic = {
+        eid: {
+            "title": config.domestic_events[eid]["title"],
+            "paper": _summarize(stats["domestic_paper"][eid]),
+            "model": _summarize(stats["domestic_model"][eid]),
+        }
+        for eid in sorted(stats["domestic_paper"])
+    }
+    international = {
+        idx: {
+            "title": config.international_events[idx]["title"],
+            "paper": _summarize(stats["international_paper"][idx]),
+            "model": _summarize(stats["international_model"][idx]),
+        }
+        for idx in sorted(stats["international_paper"])
+    }
+    return {"countries": countries, "domestic_events": domestic, "international_events": international}
+
+
+def simulate(games: int, rounds: int = 10, seed: int = 0, workers=None) -> dict:
+    """전체 시뮬레이션을 실행하고 집계한 보고서를 반환합니다."""
+    chunks = [CHUNK_GAMES] * (games // CHUNK_GAMES) + ([games % CHUNK_GAMES] if games % CHUNK_GAMES else [])
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(chunks))]
+    stats = _new_stats()
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        for s, n in zip(seeds, chunks):
+            _merge(stats, run_chunk(s, n, rounds))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(run_chunk, seeds, chunks, [rounds] * len(chunks)):
+                _merge(stats, part)
+    return report(stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulator for the event catalog.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--out", default="balance.json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = simulate(args.games, args.rounds, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    result["run"] = {**vars(args), "seconds": round(elapsed, 1),
+                     "rounds_per_second": round(args.games * args.rounds / elapsed)}
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=4, ensure_ascii=False)
+
+    print(f"{args.games * args.rounds} rounds in {elapsed:.1f}s -> {args.out}")
+    for name, c in result["countries"].items():
+        p, m = c["round_paper_delta"], c["round_model_delta"]
+        print(f"{name:<14} papers/round p5={p['p5']:>6} p50={p['p50']:>6} p95={p['p95']:>6}   "
+              f"models/round p5={m['p5']:>6} p50={m['p50']:>6} p95={m['p95']:>6}")
+
+
+if __name__ == "__main__":
+    main()
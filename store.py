@@ -0,0 +1,359 @@
+# store.py
+# 팀들이 공유하는 게임 상태를 SQLite(WAL) 파일 하나(config.db_path)에 저장합니다.
+# 모든 테이블의 키는 (game, round, ...)이므로 새 라운드가 이전 라운드를 덮어쓰지 않습니다.
+# game= 은 로비 id (create_game), round=None 은 그 게임의 현재 라운드입니다.
+# hidden 파라미터는 예전 hidden_{team}.json처럼 다음 라운드로 이어집니다 (그 라운드 이하의 최신 값).
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+import instrument
+
+DEFAULT_GAME = "default"
+GAME_ID_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,31}")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game TEXT PRIMARY KEY,
+    current_round INTEGER NOT NULL DEFAULT 1,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hidden (
+    game TEXT NOT NULL, round INTEGER NOT NULL, team TEXT NOT NULL,
+    params TEXT NOT NULL,
+    PRIMARY KEY (game, team, round)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cooperation (
+    game TEXT NOT NULL, round INTEGER NOT NULL, team TEXT NOT NULL,
+    offers TEXT NOT NULL,
+    PRIMARY KEY (game, round, team)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS domestic (
+    game TEXT NOT NULL, round INTEGER NOT NULL, team TEXT NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (game, round, team)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS round_draws (
+    game TEXT NOT NULL, round INTEGER NOT NULL, name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (game, round, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS team_versions (
+    game TEXT NOT NULL, round INTEGER NOT NULL, team TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (game, round, team)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    game TEXT NOT NULL, round INTEGER NOT NULL,
+    scores TEXT NOT NULL,
+    PRIMARY KEY (game, round)
+) WITHOUT ROWID;
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()   # 이 프로세스에서 스키마를 확인한 DB 경로
+
+
+def connect() -> sqlite3.Connection:
+    """스레드마다 연결 하나 (Streamlit은 세션마다 다른 스레드에서 스크립트를 실행)."""
+    path = str(config.db_path)
+    conn = getattr(_local, "conns", {}).get(path)
+    if conn is None:
+        config.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not hasattr(_local, "conns"):
+            _local.conns = {}
+        _local.conns[path] = conn
+        with _init_lock:
+            if path not in _initialized:
+                conn.executescript(SCHEMA)
+                _import_legacy_json(conn)
+                _initialized.add(path)
+    return conn
+
+
+@contextmanager
+def transaction():
+    """BEGIN IMMEDIATE ... COMMIT: 쓰기 잠금을 먼저 잡아 동시에 쓰는 세션들이 차례로 기다리게 합니다."""
+    conn = connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _loads(text: str):
+    if instrument.ENABLED:
+        instrument.count("store.reads")
+        instrument.count("store.bytes_read", len(text))
+    return json.loads(text)
+
+
+def _dump(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False)
+
+
+# --- 게임 (로비) ---
+
+def valid_game_id(game) -> bool:
+    return isinstance(game, str) and GAME_ID_PATTERN.fullmatch(game) is not None
+
+
+def create_game(game) -> bool:
+    """라운드 1에서 새 로비를 엽니다. 이미 있으면 False."""
+    if not valid_game_id(game):
+        raise ValueError(f"Invalid game id {game!r}: use up to 32 letters, digits, '-' or '_'")
+    cur = connect().execute(
+        "INSERT OR IGNORE INTO games (game, current_round, created) VALUES (?, 1, ?)", (game, time.time())
+    )
+    return cur.rowcount == 1
+
+
+def list_games() -> list:
+    """모든 로비의 [(game, current_round)], 오래된 순."""
+    return connect().execute("SELECT game, current_round FROM games ORDER BY created, game").fetchall()
+
+
+# --- 라운드 ---
+
+def current_round(game=DEFAULT_GAME) -> int:
+    conn = connect()
+    row = conn.execute("SELECT current_round FROM games WHERE game = ?", (game,)).fetchone()
+    if row is None:
+        conn.execute("INSERT OR IGNORE INTO games (game, current_round, created) VALUES (?, 1, ?)", (game, time.time()))
+        return current_round(game)
+    return row[0]
+
+
+def advance_round(game, from_round: int) -> int:
+    """from_round에서 다음 라운드로 넘기고 새 현재 라운드를 반환합니다 (여러 팀이 눌러도 한 번만)."""
+    current_round(game)
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE games SET current_round = current_round + 1 WHERE game = ? AND current_round = ?",
+            (game, from_round),
+        )
+        return conn.execute("SELECT current_round FROM games WHERE game = ?", (game,)).fetchone()[0]
+
+
+def _round(game, round):
+    return current_round(game) if round is None else round
+
+
+# --- 입력 버전 ---
+
+def _save_team_row(table, column, team, value, game, round):
+    """한 팀의 행을 저장하고 그 라운드의 버전을 올립니다 (한 트랜잭션)."""
+    round = _round(game, round)
+    with transaction() as conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} (game, round, team, {column}) VALUES (?, ?, ?, ?)",
+            (game, round, team, _dump(value)),
+        )
+        conn.execute(
+            "INSERT INTO team_versions (game, round, team, version) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT (game, round, team) DO UPDATE SET version = version + 1",
+            (game, round, team),
+        )
+
+
+def team_versions(game=DEFAULT_GAME, round=None) -> dict:
+    """
+    팀 -> 이번 라운드에 hidden/cooperation/domestic을 저장한 횟수.
+    버전이 같으면 입력도 같으므로 캐시는 행을 다시 읽지 않고 이 값을 키로 씁니다.
+    """
+    rows = connect().execute(
+        "SELECT team, version FROM team_versions WHERE game = ? AND round = ?", (game, _round(game, round))
+    ).fetchall()
+    return dict(rows)
+
+
+# --- Hidden 파라미터 ---
+
+def save_hidden(team, params: dict, game=DEFAULT_GAME, round=None):
+    _save_team_row("hidden", "params", team, params, game, round)
+
+
+def load_hidden(team, game=DEFAULT_GAME, round=None):
+    row = connect().execute(
+        "SELECT params FROM hidden WHERE game = ? AND team = ? AND round <= ? ORDER BY round DESC LIMIT 1",
+        (game, team, _round(game, round)),
+    ).fetchone()
+    return _loads(row[0]) if row else None
+
+
+def load_all_hidden(game=DEFAULT_GAME, round=None) -> dict:
+    """팀 -> load_hidden(팀). 저장한 팀 모두를 쿼리 한 번으로."""
+    rows = connect().execute(
+        "SELECT h.team, h.params FROM hidden h WHERE h.game = ? AND h.round = "
+        "(SELECT MAX(round) FROM hidden WHERE game = h.game AND team = h.team AND round <= ?)",
+        (game, _round(game, round)),
+    ).fetchall()
+    return {team: _loads(params) for team, params in rows}
+
+
+# --- 협력 ---
+
+def save_cooperation(team, offers: dict, game=DEFAULT_GAME, round=None):
+    _save_team_row("cooperation", "offers", team, offers, game, round)
+
+
+def load_cooperation(team, game=DEFAULT_GAME, round=None):
+    row = connect().execute(
+        "SELECT offers FROM cooperation WHERE game = ? AND round = ? AND team = ?",
+        (game, _round(game, round), team),
+    ).fetchone()
+    return _loads(row[0]) if row else None
+
+
+def load_all_cooperation(game=DEFAULT_GAME, round=None) -> dict:
+    """팀 -> load_cooperation(팀). 이번 라운드에 저장한 팀 모두를 쿼리 한 번으로."""
+    rows = connect().execute(
+        "SELECT team, offers FROM cooperation WHERE game = ? AND round = ?", (game, _round(game, round))
+    ).fetchall()
+    return {team: _loads(offers) for team, offers in rows}
+
+
+# --- 이벤트 ---
+
+def save_domestic(team, event: dict, game=DEFAULT_GAME, round=None):
+    _save_team_row("domestic", "event", team, event, game, round)
+
+
+def load_domestic(team, game=DEFAULT_GAME, round=None):
+    row = connect().execute(
+        "SELECT event FROM domestic WHERE game = ? AND round = ? AND team = ?",
+        (game, _round(game, round), team),
+    ).fetchone()
+    return _loads(row[0]) if row else None
+
+
+def draw_international(draw_fn, game=DEFAULT_GAME, round=None):
+    """이번 라운드의 국제 이벤트 (처음 도착한 팀이 뽑음). (events, drawn_here)를 반환합니다."""
+    return draw_once("international", draw_fn, game, round)
+
+
+def load_international(game=DEFAULT_GAME, round=None):
+    return load_draw("international", game, round)
+
+
+# --- 라운드당 한 번만 뽑기 ---
+
+def draw_once(name, draw_fn, game=DEFAULT_GAME, round=None):
+    """
+    모든 팀이 공유해야 하는 무작위 결과 (예: 국제 이벤트). (game, round, name)의 첫 호출만 draw_fn()을
+    실행해 저장하고, 이후 호출은 어느 세션/프로세스에서든 저장된 값을 받습니다. (value, drawn_here)
+    """
+    round = _round(game, round)
+    value = load_draw(name, game, round)
+    if value is not None:
+        return value, False
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT value FROM round_draws WHERE game = ? AND round = ? AND name = ?", (game, round, name)
+        ).fetchone()
+        if row:
+            return _loads(row[0]), False
+        value = draw_fn()
+        conn.execute("INSERT INTO round_draws (game, round, name, value) VALUES (?, ?, ?, ?)", (game, round, name, _dump(value)))
+    return value, True
+
+
+def draw_exists(name, game=DEFAULT_GAME, round=None) -> bool:
+    return connect().execute(
+        "SELECT 1 FROM round_draws WHERE game = ? AND round = ? AND name = ?",
+        (game, _round(game, round), name),
+    ).fetchone() is not None
+
+
+def load_draw(name, game=DEFAULT_GAME, round=None):
+    """저장된 draw_once 결과. 아직 아무도 뽑지 않았으면 None."""
+    row = connect().execute(
+        "SELECT value FROM round_draws WHERE game = ? AND round = ? AND name = ?",
+        (game, _round(game, round), name),
+    ).fetchone()
+    return _loads(row[0]) if row else None
+
+
+# --- 기록 ---
+# 끝난 라운드마다 한 행씩 추가만 하고 (game, round) 기본 키로 찾습니다.
+
+def save_history(round_data: dict, game=DEFAULT_GAME) -> bool:
+    """끝난 라운드를 기록합니다. 같은 라운드는 처음 기록만 남기며, 이번 호출이 추가했으면 True."""
+    cur = connect().execute(
+        "INSERT OR IGNORE INTO history (game, round, scores) VALUES (?, ?, ?)",
+        (game, round_data["round"], _dump(round_data["scores"])),
+    )
+    return cur.rowcount == 1
+
+
+def _history_rows(rows):
+    return [{"round": r, "scores": _loads(s)} for r, s in rows]
+
+
+def load_history(game=DEFAULT_GAME) -> list:
+    rows = connect().execute("SELECT round, scores FROM history WHERE game = ? ORDER BY round", (game,)).fetchall()
+    return _history_rows(rows)
+
+
+def history_range(first: int, last: int, game=DEFAULT_GAME) -> list:
+    """기록된 라운드 first..last (포함), 순서대로."""
+    rows = connect().execute(
+        "SELECT round, scores FROM history WHERE game = ? AND round BETWEEN ? AND ? ORDER BY round",
+        (game, first, last),
+    ).fetchall()
+    return _history_rows(rows)
+
+
+def latest_history(game=DEFAULT_GAME, before_round=None):
+    """마지막으로 기록된 라운드 (before_round가 있으면 그 이전). 없으면 None."""
+    rows = connect().execute(
+        "SELECT round, scores FROM history WHERE game = ? AND round < ? ORDER BY round DESC LIMIT 1",
+        (game, before_round if before_round is not None else 2 ** 62),
+    ).fetchall()
+    return _history_rows(rows)[0] if rows else None
+
+
+# --- JSON 파일에서 옮기기 ---
+
+def _import_legacy_json(conn):
+    """예전 배포가 shared_dir에 남긴 JSON 파일을 기본 게임으로 한 번만 가져옵니다."""
+    if conn.execute("SELECT 1 FROM games WHERE game = ?", (DEFAULT_GAME,)).fetchone():
+        return
+
+    def read(name):
+        path = config.shared_dir / name
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    history = read("history.json") or []
+    round = max((d["round"] for d in history), default=0) + 1
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("INSERT INTO games (game, current_round, created) VALUES (?, ?, ?)", (DEFAULT_GAME, round, time.time()))
+        for d in history:
+            conn.execute("INSERT OR IGNORE INTO history VALUES (?, ?, ?)", (DEFAULT_GAME, d["round"], _dump(d["scores"])))
+        for team in config.team_credentials:
+            for table, prefix in (("hidden", "hidden"), ("cooperation", "cooperation"), ("domestic", "domestic")):
+                data = read(f"{prefix}_{team}.json")
+                if data is not None:
+                    conn.execute(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)", (DEFAULT_GAME, round, team, _dump(data)))
+        events = read("international.json")
+        if events is not None:
+            conn.execute("INSERT OR REPLACE INTO round_draws VALUES (?, ?, 'international', ?)", (DEFAULT_GAME, round, _dump(events)))
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
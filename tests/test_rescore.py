@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import rescore
+
+
+def test_incremental_matches_full_recompute():
+    # check()는 전체 재계산과 다르면 AssertionError를 냅니다
+    evaluated = rescore.check(samples=200, seed=0)
+    assert 0 < evaluated["incremental"] < evaluated["full"]
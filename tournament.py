@@ -0,0 +1,278 @@
+# tournament.py
+# 봇 전략 토너먼트: 모든 팀을 봇이 두는 게임을 엔진으로 여러 번 돌려 전략별/조합별 승률,
+# 평균 모델/논문 수, 네 팀 합계가 미국·중국을 넘는 비율을 냅니다.
+#   python tournament.py --games 10000 --rounds 10 --workers 8 --seed 0 --out tournament.json
+#   python tournament.py --games 2000 --mix always_cooperate,grim_trigger,max_growth,intel_heavy
+# --mix가 없으면 게임마다 전략을 무작위로 고릅니다. 시드는 simulate.py처럼 묶음마다 파생합니다.
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import config
+import engine
+import optimizer
+import utils
+
+CHUNK_GAMES = 25
+COOP_PARAMS = list(config.coop_params)
+
+
+# --- 전략 ---
+
+class Bot:
+    """
+    한 팀을 게임 내내 두는 봇. 하위 클래스는 extras (성장 외 슬라이더, 나머지 포인트는
+    optimizer.best_growth_allocation)와 wish (우선순위 순 협력 제안)를 정합니다.
+    """
+    name = "bot"
+    extras = {"Alignment_US": 5, "Willing_to_Cooperate": 5}
+    wish = {}
+
+    def __init__(self, team: str):
+        self.team = team
+        self.partners = [t for t in engine.PLAYER_TEAMS if t != team]
+        self.policy = self._policy()
+        self.limit = utils.coop_limit(self.policy)
+
+    def _policy(self) -> dict:
+        extras = dict(self.extras)
+        spent = sum(v for p, v in extras.items() if p != "Alignment_US")
+        policy = {**extras, **optimizer.best_growth_allocation(optimizer.FREE_BUDGET - spent)}
+        policy["Alignment_China"] = 10 - policy["Alignment_US"]
+        return policy
+
+    def offers_to(self, partner: str) -> dict:
+        return self.wish
+
+    def decide(self) -> engine.TeamDecision:
+        # 파트너마다 협력 한도를 똑같이 나눠 씁니다 (한도 초과 시 settle_cooperation이 거부).
+        share = self.limit // len(self.partners)
+        cooperation = {}
+        for partner in self.partners:
+            offer, left = engine.default_cooperation(), share
+            for param, value in self.offers_to(partner).items():
+                points = config.coop_params[param]["points"]
+                if value not in ("None", "No") and points <= left:
+                    offer[param] = value
+                    left -= points
+            cooperation[partner] = offer
+        return engine.TeamDecision(policy=self.policy, cooperation=cooperation)
+
+    def observe(self, decisions: dict, report: engine.RoundReport):
+        """매 라운드 뒤 모든 팀의 결정과 라운드 보고서를 받습니다."""
+
+
+ALL_IN = {k: "Yes" for k, v in config.coop_params.items() if v["type"] == "bool"}
+ALL_IN["Joint_Project"] = "Energy"
+
+
+class AlwaysCooperate(Bot):
+    """Willing_to_Cooperate 최대, 매 라운드 모두에게 모든 것을 제안합니다."""
+    name = "always_cooperate"
+    extras = {"Alignment_US": 5, "Willing_to_Cooperate": 10}
+    wish = ALL_IN
+
+
+class GrimTrigger(Bot):
+    """always_cooperate처럼 협력하다가 제안에 응하지 않은 파트너와는 다시 협력하지 않습니다."""
+    name = "grim_trigger"
+    extras = {"Alignment_US": 5, "Willing_to_Cooperate": 8}
+    wish = ALL_IN
+
+    def __init__(self, team):
+        super().__init__(team)
+        self.betrayed_by = set()
+
+    def offers_to(self, partner):
+        return {} if partner in self.betrayed_by else self.wish
+
+    def observe(self, decisions, report):
+        mine = decisions[self.team].cooperation
+        for partner in self.partners:
+            offered = {k for k, v in mine[partner].items() if v not in ("None", "No")}
+            if any(report.cooperation[self.team][partner][k] != mine[partner][k] for k in offered):
+                self.betrayed_by.add(partner)
+
+
+class MaxGrowth(Bot):
+    """남는 포인트를 모두 성장에 (Willing_to_Cooperate 0), 협력 제안 없음."""
+    name = "max_growth"
+    extras = {"Alignment_US": 5}
+
+
+class USAligned(Bot):
+    """Alignment_US 10, 미국 표준·사이버보안·이중용도 협정을 제안합니다."""
+    name = "us_aligned"
+    extras = {"Alignment_US": 10, "Willing_to_Cooperate": 5}
+    wish = {"AI_Standard_Alignment": "US", "Cybersecurity_Pact": "Yes", "Dual_Use_Restrictions": "Yes",
+            "Computing_Power_Shared": "Yes", "Data_Shared": "Yes"}
+
+
+class ChinaAligned(USAligned):
+    """Alignment_US 0 (China 10), 같은 제안을 중국 표준으로."""
+    name = "china_aligned"
+    extras = {"Alignment_US": 0, "Willing_to_Cooperate": 5}
+    wish = {**USAligned.wish, "AI_Standard_Alignment": "China"}
+
+
+class IntelHeavy(Bot):
+    """Intelligence 최대, 각 파트너에게 지난 라운드에 그 파트너가 낸 제안을 그대로 돌려줍니다."""
+    name = "intel_heavy"
+    extras = {"Alignment_US": 5, "Willing_to_Cooperate": 5, "Intelligence": 10}
+    wish = {"Cybersecurity_Pact": "Yes", "Talent_Exchange": "Yes"}   # 첫 라운드
+
+    def __init__(self, team):
+        super().__init__(team)
+        self.last_offers = {}
+
+    def offers_to(self, partner):
+        return self.last_offers.get(partner, self.wish)
+
+    def observe(self, decisions, report):
+        self.last_offers = {p: decisions[p].cooperation.get(self.team, {}) for p in self.partners}
+
+
+STRATEGIES = {cls.name: cls for cls in (AlwaysCooperate, GrimTrigger, MaxGrowth, USAligned, ChinaAligned, IntelHeavy)}
+
+
+# --- 게임 ---
+
+def play_game(mix: tuple, rounds: int, rng) -> dict:
+    """게임 한 판. mix는 engine.PLAYER_TEAMS 순서의 팀별 전략 이름."""
+    bots = {team: STRATEGIES[name](team) for team, name in zip(engine.PLAYER_TEAMS, mix)}
+    state = engine.GameState()
+    for _ in range(rounds):
+        decisions = {team: bot.decide() for team, bot in bots.items()}
+        report = engine.play_round(state, decisions, rng)
+        for bot in bots.values():
+            bot.observe(decisions, report)
+    return state.scores
+
+
+def _winners(scores: dict) -> list:
+    best = max((scores[t]["models"], scores[t]["papers"]) for t in engine.PLAYER_TEAMS)
+    return [t for t in engine.PLAYER_TEAMS if (scores[t]["models"], scores[t]["papers"]) == best]
+
+
+def _new_stats():
+    return {
+        "strategy": defaultdict(Counter),   # 전략 -> games / wins / models / papers
+        "mix": defaultdict(Counter),        # "a+b+c+d" (정렬) -> games / beats_us / beats_china / beats_both
+        "mix_wins": defaultdict(Counter),   # 조합 -> 전략 -> 승리
+    }
+
+
+def _merge(into, other):
+    for table, by_key in other.items():
+        for key, counts in by_key.items():
+            into[table][key].update(counts)
+
+
+def run_chunk(seed: int, games: int, rounds: int, mix=None) -> dict:
+    """한 시드로 games판을 두고 집계를 반환합니다."""
+    rng = random.Random(seed)
+    stats = _new_stats()
+    names = sorted(STRATEGIES)
+    for _ in range(games):
+        game_mix = tuple(mix) if mix else tuple(rng.choice(names) for _ in engine.PLAYER_TEAMS)
+        scores = play_game(game_mix, rounds, rng)
+        winners = _winners(scores)
+        key = "+".join(sorted(game_mix))
+        for team, name in zip(engine.PLAYER_TEAMS, game_mix):
+            s = stats["strategy"][name]
+            s["games"] += 1
+            s["models"] += scores[team]["models"]
+            s["papers"] += scores[team]["papers"]
+            if team in winners:
+                s["wins"] += 1 / len(winners)   # 동점이면 승리를 나눠 가집니다
+                stats["mix_wins"][key][name] += 1 / len(winners)
+        coalition = sum(scores[t]["models"] for t in engine.PLAYER_TEAMS)
+        beats_us = coalition > scores["United States"]["models"]
+        beats_china = coalition > scores["China"]["models"]
+        m = stats["mix"][key]
+        m["games"] += 1
+        m["beats_us"] += beats_us
+        m["beats_china"] += beats_china
+        m["beats_both"] += beats_us and beats_china
+    return stats
+
+
+def report(stats: dict) -> dict:
+    strategies = {
+        name: {
+            "games": s["games"],
+            "win_rate": round(s["wins"] / s["games"], 4),
+            "mean_models": round(s["models"] / s["games"], 2),
+            "mean_papers": round(s["papers"] / s["games"], 2),
+        }
+        for name, s in sorted(stats["strategy"].items())
+    }
+    mixes = {}
+    for key, m in sorted(stats["mix"].items(), key=lambda kv: -kv[1]["games"]):
+        n = m["games"]
+        mixes[key] = {
+            "games": n,
+            "coalition_beats_us": round(m["beats_us"] / n, 4),
+            "coalition_beats_china": round(m["beats_china"] / n, 4),
+            "coalition_beats_both": round(m["beats_both"] / n, 4),
+            "wins": {name: round(w / n, 4) for name, w in sorted(stats["mix_wins"][key].items())},
+        }
+    return {"strategies": strategies, "mixes": mixes}
+
+
+def tournament(games: int, rounds: int = 10, seed: int = 0, workers=None, mix=None) -> dict:
+    """전체 토너먼트를 실행하고 집계한 보고서를 반환합니다."""
+    chunks = [CHUNK_GAMES] * (games // CHUNK_GAMES) + ([games % CHUNK_GAMES] if games % CHUNK_GAMES else [])
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(chunks))]
+    stats = _new_stats()
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        for s, n in zip(seeds, chunks):
+            _merge(stats, run_chunk(s, n, rounds, mix))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(run_chunk, seeds, chunks, [rounds] * len(chunks), [mix] * len(chunks)):
+                _merge(stats, part)
+    return report(stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tournament runner for scripted bot strategies.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--mix", help=f"comma-separated strategy per team ({', '.join(engine.PLAYER_TEAMS)}); "
+                                      f"default: drawn per game from {', '.join(STRATEGIES)}")
+    parser.add_argument("--out", default="tournament.json")
+    args = parser.parse_args()
+
+    mix = args.mix.split(",") if args.mix else None
+    if mix and (len(mix) != len(engine.PLAYER_TEAMS) or not set(mix) <= set(STRATEGIES)):
+        parser.error(f"--mix needs {len(engine.PLAYER_TEAMS)} names out of {', '.join(STRATEGIES)}")
+
+    start = time.perf_counter()
+    result = tournament(args.games, args.rounds, args.seed, args.workers, mix)
+    elapsed = time.perf_counter() - start
+    result["run"] = {**vars(args), "seconds": round(elapsed, 1),
+                     "games_per_second": round(args.games / elapsed, 1)}
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=4, ensure_ascii=False)
+
+    print(f"{args.games} games x {args.rounds} rounds in {elapsed:.1f}s -> {args.out}")
+    print(f"{'strategy':<18} {'games':>7} {'win rate':>9} {'models':>9} {'papers':>9}")
+    for name, s in result["strategies"].items():
+        print(f"{name:<18} {s['games']:>7} {s['win_rate']:>9.3f} {s['mean_models']:>9.1f} {s['mean_papers']:>9.1f}")
+    print(f"\n{'mix (most played)':<72} {'games':>6} {'>US':>6} {'>China':>7}")
+    for key, m in list(result["mixes"].items())[:10]:
+        print(f"{key:<72} {m['games']:>6} {m['coalition_beats_us']:>6.2f} {m['coalition_beats_china']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,41 @@
 # utils.py
-import streamlit as st
 import numpy as np
 import math
 import random
-from scipy.stats import norm
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 import config # config.py file
-import json
+import formulas
+import instrument
+import store
 
 u = 84.17
 threshold = 40 * u / 19
 
-def calculate_ai_models(paper_count, normalize_to=15, reference_variance=2000):
-    std_dev = np.sqrt(paper_count)
-    z_score = (threshold - u) / std_dev
-    probability = 1 - norm.cdf(z_score)
+# 정규분포 꼬리 확률: 1 - Φ(z) = erfc(z / √2) / 2 (scipy 없이 math.erfc로)
+# 게임에서 넘기는 배열은 작아서 (finish_round는 2개, outcomes는 서로 다른 논문 수만) 원소별 호출로 충분하고,
+# 스칼라 경로와 비트 단위로 같은 값을 줍니다.
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+def normal_sf(z):
+    """표준정규분포의 생존함수 1 - Φ(z). 스칼라와 NumPy 배열 모두 받습니다."""
+    if np.ndim(z) == 0:
+        return 0.5 * math.erfc(float(z) / math.sqrt(2))
+    return 0.5 * _erfc(np.asarray(z, dtype=float) / math.sqrt(2))
 
-    reference_std = np.sqrt(reference_variance)
-    ref_prob = 1 - norm.cdf((threshold - u) / reference_std)
-    scaling_factor = normalize_to / ref_prob
+@lru_cache(maxsize=None)
+def _model_scaling_factor(normalize_to, reference_variance):
+    """기준 분산에서의 확률이 normalize_to개 모델이 되도록 하는 배율. 파라미터 조합마다 한 번만 계산합니다."""
+    ref_prob = normal_sf((threshold - u) / math.sqrt(reference_variance))
+    return normalize_to / ref_prob
 
-    return probability * scaling_factor
+def calculate_ai_models(paper_count, normalize_to=15, reference_variance=2000):
+    """논문 수(스칼라 또는 배열)로부터 예상 AI 모델 수를 계산합니다."""
+    # 논문 수가 0 이하이면 (국내/국제 이벤트로 음수가 될 수 있음) 모델도 0
+    with np.errstate(divide="ignore"):
+        z_score = (threshold - u) / np.sqrt(np.maximum(paper_count, 0))
+    return normal_sf(z_score) * _model_scaling_factor(normalize_to, reference_variance)
     
 def process_coop_params(raw: dict) -> dict:
     out = {}
@@ -38,32 +54,7 @@ def process_coop_params(raw: dict) -> dict:
     return out
 
 def evaluate_delta(expr: str, params: dict) -> int:
-    safe_locals = {
-        k: params[k]
-        for k in params
-        if isinstance(params[k], (int, float, str)) or params[k] is None
-    }
-    try:
-        return int(eval(
-            expr,
-            {
-                "__builtins__": {},
-                "round": round,
-                "min": min,
-                "max": max,
-                "int": int,
-                "sqrt": np.sqrt,
-                "np": np,
-                "mean": np.mean,
-                "log": math.log,
-                "exp": math.exp,
-                "abs": abs
-            },
-            safe_locals
-        ))
-    except Exception as e:
-        st.error(f"Error evaluating expression:\n{expr}\n\n{e}")
-        return 0
+    return formulas.evaluate_expr(expr, params)
 
 def evaluate_event_international(expr: str, hidden: dict, coop_dict: dict) -> int:
     total = 0
@@ -73,18 +64,156 @@ def evaluate_event_international(expr: str, hidden: dict, coop_dict: dict) -> in
         total += evaluate_delta(expr, combined)
     return total
 
+def pack_international(hidden_by_team: dict, coop_by_team: dict, teams: list, partners: list):
+    """
+    hidden 파라미터와 양자 협력 행렬을 (팀 × 파트너) NumPy 컬럼으로 묶습니다.
+    hidden 전용 파라미터는 (팀 × 1), 협력 파라미터는 (팀 × 파트너) 모양입니다.
+    mask는 팀의 cooperation dict에 실제로 있는 (팀, 파트너) 칸을 표시합니다.
+    mask 밖의 칸 (자기 자신 등)은 평가하지 않으므로 0으로 채워 열이 숫자 dtype으로 남게 합니다.
+    """
+    def cell(v):
+        # evaluate_delta의 safe_locals와 같은 규칙: 스칼라가 아니면 없는 값으로 취급
+        return v if isinstance(v, (int, float, str)) or v is None else formulas.MISSING
+
+    hidden = [hidden_by_team.get(t, {}) for t in teams]
+    bilateral = [
+        [process_coop_params(coop_by_team.get(t, {})[p]) if p in coop_by_team.get(t, {}) else {} for p in partners]
+        for t in teams
+    ]
+    mask = np.array([[p in coop_by_team.get(t, {}) for p in partners] for t in teams], dtype=bool).reshape(len(teams), len(partners))
+
+    coop_names = {k for row in bilateral for b in row for k in b}
+    hidden_names = {k for h in hidden for k in h} - coop_names
+
+    rows = {}
+    for name in hidden_names:
+        rows[name] = [[cell(h.get(name, formulas.MISSING))] for h in hidden]
+    for name in coop_names:
+        # {**hidden, **bilateral}와 같은 우선순위
+        rows[name] = [
+            [cell(b[name]) if name in b else cell(h.get(name, formulas.MISSING)) if m else 0
+             for b, m in zip(row, mask_row)]
+            for h, row, mask_row in zip(hidden, bilateral, mask.tolist())
+        ]
+    return formulas.pack_columns(rows), mask
+
+def international_params(hidden_by_team: dict, coop_by_team: dict, teams: list, partners: list) -> list:
+    """
+    pack_international의 스칼라 버전: [팀][파트너] -> formulas.safe_params({**hidden, **bilateral})
+    (cooperation dict에 없는 파트너는 None). hidden은 팀마다 한 번만 정리합니다.
+    """
+    out = []
+    for t in teams:
+        hidden = formulas.safe_params(hidden_by_team.get(t, {}))
+        row = []
+        for p in partners:
+            if p not in coop_by_team.get(t, {}):
+                row.append(None)
+                continue
+            bilateral = process_coop_params(coop_by_team[t][p])
+            safe = formulas.safe_params(bilateral)
+            params = {**hidden, **safe}
+            for k in bilateral.keys() - safe.keys():
+                params.pop(k, None)   # {**hidden, **bilateral}에서 걸러지는 값은 hidden 값도 가립니다
+            row.append(params)
+        out.append(row)
+    return out
+
+def international_partners(coop_by_team: dict, teams: list) -> list:
+    """파트너 축: 플레이어 팀 순서, 그 뒤에 cooperation dict에만 있는 국가."""
+    partners = list(config.team_credentials)
+    partners += [p for t in teams for p in coop_by_team.get(t, {}) if p not in partners]
+    return partners
+
+# (팀 × 파트너) 칸 수 × 수식 수가 이보다 적으면 벡터화보다 스칼라 평가가 빠릅니다.
+# 벡터 경로는 열을 묶는 비용과 수식마다 수십 µs의 고정 비용이 있기 때문입니다 (benchmarks/hotpaths.py의
+# evaluate_international[...] 비교: 32칸 × 90수식은 스칼라 6.3 / 벡터 7.4 ms, 64칸 × 90수식은 11.2 / 9.2 ms).
+# 게임 한 라운드 (16칸 × 4수식)는 스칼라 경로를 씁니다.
+BATCH_MIN_EVALUATIONS = 4000
+
+def evaluate_international_exprs(exprs: list, hidden_by_team: dict, coop_by_team: dict, teams=None, partners=None) -> np.ndarray:
+    """
+    국제 이벤트 수식들을 모든 팀과 파트너에 대해 평가합니다. (팀, 수식, 파트너) int 배열.
+    각 칸은 evaluate_delta(expr, {**hidden, **bilateral})와 같은 값이고, 크기에 따라 스칼라/벡터 경로를 고릅니다.
+    """
+    teams = list(hidden_by_team) if teams is None else teams
+    partners = international_partners(coop_by_team, teams) if partners is None else partners
+    out = np.zeros((len(teams), len(exprs), len(partners)), dtype=np.int64)
+    if len(teams) * len(partners) * len(exprs) < BATCH_MIN_EVALUATIONS:
+        params = international_params(hidden_by_team, coop_by_team, teams, partners)
+        for i, row in enumerate(params):
+            for j, p in enumerate(row):
+                if p is not None:
+                    out[i, :, j] = formulas.evaluate_exprs(exprs, p)
+        return out
+
+    columns, mask = pack_international(hidden_by_team, coop_by_team, teams, partners)
+    shape = (len(teams), len(partners))
+    for e, expr in enumerate(exprs):
+        out[:, e, :] = formulas.evaluate_batch(expr, columns, shape, mask)
+    return out
+
+def evaluate_international_batch(events: list, hidden_by_team: dict, coop_by_team: dict, teams=None, partners=None) -> np.ndarray:
+    """
+    선택된 모든 국제 이벤트를 모든 팀과 파트너에 대해 한 번에 평가합니다.
+    (팀, 이벤트, 파트너, 2) int 배열을 반환하며 마지막 축은 [delta_papers, delta_models]입니다.
+    """
+    exprs = [event[field] for event in events for field in formulas.FIELDS]
+    out = evaluate_international_exprs(exprs, hidden_by_team, coop_by_team, teams, partners)
+    t, _, p = out.shape
+    return out.reshape(t, len(events), len(formulas.FIELDS), p).transpose(0, 1, 3, 2)
+
+# Policy 페이지의 슬라이더 파라미터 (Alignment_US + Alignment_China = 10)
+POLICY_PARAMS = [p for group in config.parameter_groups.values() for p in group]
+POLICY_BUDGET = 100
+
+def policy_points(params: dict) -> int:
+    """Policy 페이지와 같은 방식으로 사용한 정책 포인트를 계산합니다."""
+    return sum(params.get(p, 0) for p in POLICY_PARAMS)
+
+def coop_points_used(state: dict, partners) -> tuple:
+    """협력 포인트 사용량을 (총합, {파트너: 포인트})로 계산합니다."""
+    total_points_used = 0
+    country_points = {p: 0 for p in partners}
+    for param, meta in config.coop_params.items():
+        for country in partners:
+            val = state.get(country, {}).get(param, "None")
+            if val not in ["None", "No", "", None]:
+                total_points_used += meta["points"]
+                country_points[country] += meta["points"]
+    return total_points_used, country_points
+
+def coop_limit(hidden_params: dict) -> int:
+    return 20 + hidden_params.get("Willing_to_Cooperate", 5)
+
 def category_to_multiplier(val, mapping):
     return mapping.get(str(val).strip(), 1.0)
     
+# 성장률의 항: 이름 -> (읽는 파라미터, 계산 함수). 항별로 나눠 두어 rescore.py가 바뀐 항만 다시 계산합니다.
+GROWTH_TERMS = {
+    "tech": (("Semiconductor", "Electricity", "Open_Source_Adoption", "AI_Investment_Focus"),
+             lambda p: np.log(1 + 1.2 * p["Semiconductor"] + 0.8 * p["Electricity"] + p["Open_Source_Adoption"] + 1.5 * p["AI_Investment_Focus"]) ** 1.2),
+    "human": (("Talent_Index", "Education_Investment"),
+              lambda p: np.sqrt((p["Talent_Index"] + 1) * (p["Education_Investment"] + 1))),
+    "cultural": (("AI_Literacy_Education", "Democratic_Stability_Index"),
+                 lambda p: 1.5 * 10 * (np.tanh(0.2 * (p["AI_Literacy_Education"] + p["Democratic_Stability_Index"])) + 1)),
+}
+
+def growth_multipliers(fixed):
+    """고정값(노동력, 천연자원, GDP)에서 나오는 (labor_term, nat, gdp) 배수."""
+    labor_term = fixed["Labor"] ** 0.75
+    nat = category_to_multiplier(fixed["Natural_Resource_Reserves"], {"Low": 1, "Medium": 1.2, "High": 1.6})
+    gdp = category_to_multiplier(fixed["GDP"], {"Low": 0.8, "Medium": 1.0, "High": 1.2})
+    return labor_term, nat, gdp
+
+def combine_growth(terms, multipliers):
+    labor_term, nat, gdp = multipliers
+    return round(4 * ((terms["tech"] * terms["human"] + terms["cultural"]) * labor_term * nat * gdp))
+
 def compute_growth_rate(params, fixed):
     try:
-        tech_term = np.log(1 + 1.2 * params["Semiconductor"] + 0.8 * params["Electricity"] + params["Open_Source_Adoption"] + 1.5 * params["AI_Investment_Focus"]) ** 1.2
-        human_term = np.sqrt((params["Talent_Index"] + 1) * (params["Education_Investment"] + 1))
-        cultural_term = 1.5 * 10 * (np.tanh(0.2 * (params["AI_Literacy_Education"] + params["Democratic_Stability_Index"])) + 1)
-        labor_term = fixed["Labor"] ** 0.75
-        nat = category_to_multiplier(fixed["Natural_Resource_Reserves"], {"Low": 1, "Medium": 1.2, "High": 1.6})
-        gdp = category_to_multiplier(fixed["GDP"], {"Low": 0.8, "Medium": 1.0, "High": 1.2})
-        return round(4 * ((tech_term * human_term + cultural_term) * labor_term * nat * gdp))
+        terms = {name: term(params) for name, (_, term) in GROWTH_TERMS.items()}
+        return combine_growth(terms, growth_multipliers(fixed))
     except:
         return None
         
@@ -97,40 +226,44 @@ def sigmoid(x):
 def intel_accuracy_prob(intelligence):
     return 0.4 * sigmoid(1.5 * (intelligence - 5)) + 0.5
 
+def _binomial(rng, n, p):
+    return sum(rng.random() < p for _ in range(n))
+
 # ——— hidden parameter 범위 정보 생성 ———
-def get_hidden_param_info(param, true_val, intel_score):
+# rng: random 모듈 또는 random.Random 인스턴스 (엔진/시뮬레이션에서 시드 고정용)
+def get_hidden_param_info(param, true_val, intel_score, rng=random):
     acc = intel_accuracy_prob(intel_score)
-    correct = random.random() < acc
+    correct = rng.random() < acc
 
     # Define margin based on intelligence score
     if intel_score <= 0:
         return f"{param}: 0~10"
     elif intel_score <=2:
-        margin = random.choice([4, 2])
+        margin = rng.choice([4, 2])
     elif intel_score <= 5: 
-        margin = random.choice([3, 2])
+        margin = rng.choice([3, 2])
     elif intel_score <= 7:
-        margin = random.choice([3, 1])
+        margin = rng.choice([3, 1])
     elif intel_score <= 9:
-        margin = random.choice([2, 1])
+        margin = rng.choice([2, 1])
     else:
-        margin = random.choice([1, 0])
+        margin = rng.choice([1, 0])
 
     if correct:
         # 🎯 비대칭 범위 (정확한 값 기준, 오른쪽이 조금 더 넓은 경향)
-        left = np.random.binomial(n=margin, p=0.3)
+        left = _binomial(rng, margin, 0.3)
         right = margin - left
         low = max(0, true_val - left)
         high = min(10, true_val + right)
     else:
         # ❌ 틀린 중심값: 70% 과대평가, 30% 과소평가
-        direction = 1 if random.random() < 0.7 else -1
-        offset = random.randint(margin + 1, margin + 2)
+        direction = 1 if rng.random() < 0.7 else -1
+        offset = rng.randint(margin + 1, margin + 2)
         fake_val = (true_val + direction * offset) % 11
 
         # 틀린 값에 대한 비대칭 범위 (우측이 넓은 경향)
-        fake_margin = random.randint(1, 2)
-        left = np.random.binomial(n=fake_margin, p=0.3)
+        fake_margin = rng.randint(1, 2)
+        left = _binomial(rng, fake_margin, 0.3)
         right = fake_margin - left
         low = max(0, fake_val - left)
         high = min(10, fake_val + right)
@@ -139,7 +272,7 @@ def get_hidden_param_info(param, true_val, intel_score):
 
 
 # ——— cooperative parameter 정보 생성 ———
-def get_coop_info(param, true_val, intel_score, options=None):
+def get_coop_info(param, true_val, intel_score, options=None, rng=random):
     # 자동 추론: options가 없으면 param 이름 기반으로 유추
     if options is None:
         if param == "Joint_Project":
@@ -150,87 +283,210 @@ def get_coop_info(param, true_val, intel_score, options=None):
             options = None  # fallback to binary
 
     acc = intel_accuracy_prob(intel_score)
-    correct = random.random() < acc
+    correct = rng.random() < acc
 
     if options:
         if correct:
             pick = true_val
         else:
             others = [o for o in options if o != true_val]
-            pick = random.choice(others) if others else true_val
+            pick = rng.choice(others) if others else true_val
     else:
         pick = true_val if correct else ("No" if true_val == "Yes" else "Yes")
 
     return f"{param}: {pick}"
 
+# ——— 정보전 스냅샷 ———
+class IntelSnapshot:
+    """
+    한 라운드의 모든 팀 hidden / cooperation 파라미터를 읽기 전용으로 고정한 것.
+    정보전 단계가 열릴 때 한 번 만들고, 1~4단계가 모두 같은 상태를 기준으로 I/O 없이 조회합니다.
+    """
+    def __init__(self, game, round, hidden_by_team, coop_by_team):
+        self.game = game
+        self.round = round
+        self._hidden = MappingProxyType({t: MappingProxyType(dict(h)) for t, h in hidden_by_team.items()})
+        self._cooperation = MappingProxyType({
+            t: MappingProxyType({p: MappingProxyType(dict(v)) for p, v in c.items()})
+            for t, c in coop_by_team.items()
+        })
+
+    def hidden(self, country):
+        """country의 hidden params. 아직 저장하지 않았다면 LookupError."""
+        if country not in self._hidden:
+            raise LookupError(country)
+        return self._hidden[country]
+
+    def cooperation(self, country):
+        """country의 cooperation 선택 (partner -> {param: value}). 아직 저장하지 않았다면 LookupError."""
+        if country not in self._cooperation:
+            raise LookupError(country)
+        return self._cooperation[country]
+
+# (game, round) -> (팀 버전, 스냅샷). 모든 세션이 공유하며, 어느 팀이든 다시 저장하면 새로 만듭니다.
+# 새 라운드의 스냅샷을 넣을 때 그 게임의 지난 라운드 항목은 지웁니다.
+_intel_snapshots = {}
+_intel_snapshots_lock = threading.Lock()
+
+def intel_snapshot(game=store.DEFAULT_GAME, round=None):
+    """이번 라운드의 최신 IntelSnapshot. 입력이 바뀌지 않았다면 캐시된 스냅샷을 그대로 반환합니다."""
+    round = store.current_round(game) if round is None else round
+    versions = tuple(sorted(store.team_versions(game, round).items()))
+    cached = _intel_snapshots.get((game, round))
+    if cached is not None and cached[0] == versions:
+        instrument.count("cache.intel_snapshot.hit")
+        return cached[1]
+    instrument.count("cache.intel_snapshot.miss")
+    snapshot = IntelSnapshot(game, round, store.load_all_hidden(game, round), store.load_all_cooperation(game, round))
+    with _intel_snapshots_lock:
+        for key in [k for k in _intel_snapshots if k[0] == game and k[1] < round]:
+            del _intel_snapshots[key]
+        _intel_snapshots[(game, round)] = (versions, snapshot)
+    return snapshot
+
 # --- Summary Page Helper Functions ---
 
-def calculate_round_results(team_name, initial_papers, initial_models, growth_rate):
-    """한 팀의 라운드 결과를 계산하고, (최종 점수, 상세 변화량 딕셔너리) 튜플을 반환합니다."""
-    try:
-        # ... (파일 로드 부분은 이전과 동일)
-        with open(config.shared_dir / f"hidden_{team_name}.json") as f:
-            hidden_params = json.load(f)
-        with open(config.shared_dir / f"cooperation_{team_name}.json") as f:
-            coop_params_raw = json.load(f)
-        with open(config.shared_dir / f"domestic_{team_name}.json") as f:
-            domestic_event = json.load(f)
-        with open(config.shared_dir / "international.json") as f:
-            international_events = json.load(f)
-
-    except FileNotFoundError:
-        return (initial_papers, initial_models), {} # 파일 없으면 빈 딕셔너리 반환
-
-    # 상세 변화량 계산
-    delta_paper_domestic = evaluate_delta(domestic_event["delta_papers"], hidden_params)
-    delta_model_domestic = evaluate_delta(domestic_event["delta_models"], hidden_params)
-    
-    delta_paper_international = sum(
-        evaluate_event_international(e["delta_papers"], hidden_params, coop_params_raw)
-        for e in international_events
-    )
-    delta_model_international = sum(
-        evaluate_event_international(e["delta_models"], hidden_params, coop_params_raw)
-        for e in international_events
-    )
+def load_round_inputs(team_name, game=store.DEFAULT_GAME, round=None):
+    """한 팀의 (hidden, cooperation, domestic event)를 로드합니다. 하나라도 없으면 None."""
+    hidden_params = store.load_hidden(team_name, game, round)
+    coop_params_raw = store.load_cooperation(team_name, game, round)
+    domestic_event = store.load_domestic(team_name, game, round)
+    if hidden_params is None or coop_params_raw is None or domestic_event is None:
+        return None
+    return hidden_params, coop_params_raw, domestic_event
+
+def load_international_events(game=store.DEFAULT_GAME, round=None):
+    """이번 라운드의 국제 이벤트를 로드합니다. 아직 결정되지 않았다면 None."""
+    return store.load_international(game, round)
 
+def finish_round(delta_paper_domestic, delta_model_domestic, international_paper, international_model,
+                 initial_papers, initial_models, growth_rate):
+    """이벤트 변화량이 모두 계산된 뒤 한 팀의 (최종 점수, 상세 변화량 딕셔너리)를 계산합니다."""
     paper_growth_this_round = growth_rate
-    
+
     # 모델 계산
-    total_paper_delta = paper_growth_this_round + delta_paper_domestic + delta_paper_international
+    total_paper_delta = paper_growth_this_round + delta_paper_domestic + international_paper
     final_papers = initial_papers + total_paper_delta
-    
-    new_models_from_papers = calculate_ai_models(final_papers) - calculate_ai_models(initial_papers)
-    final_models = initial_models + delta_model_domestic + delta_model_international + new_models_from_papers
-    
+
+    models_final, models_initial = calculate_ai_models(np.array([final_papers, initial_papers]))
+    new_models_from_papers = float(models_final - models_initial)
+    final_models = initial_models + delta_model_domestic + international_model + new_models_from_papers
+
     # 상세 내역을 딕셔너리로 반환
     delta_details = {
         'base_growth': paper_growth_this_round,
         'domestic_paper': delta_paper_domestic,
-        'international_paper': delta_paper_international,
+        'international_paper': international_paper,
         'total_paper_delta': total_paper_delta,
         'from_papers_model': new_models_from_papers,
         'domestic_model': delta_model_domestic,
-        'international_model': delta_model_international,
-        'total_model_delta': delta_model_domestic + delta_model_international + new_models_from_papers
+        'international_model': international_model,
+        'total_model_delta': delta_model_domestic + international_model + new_models_from_papers
     }
-    
+
     return (final_papers, final_models), delta_details
 
-def load_history():
-    """history.json 파일에서 모든 라운드 기록을 로드합니다."""
-    history_file = config.shared_dir / "history.json"
-    if history_file.exists():
-        with open(history_file, "r") as f:
-            return json.load(f)
-    return []
-
-def save_history(new_round_data):
-    """기존 기록에 현재 라운드 데이터를 추가하여 저장합니다."""
-    history = load_history()
-    # 같은 라운드 번호가 이미 있는지 확인하여 중복 저장을 방지
-    if not any(d['round'] == new_round_data['round'] for d in history):
-        history.append(new_round_data)
-        history_file = config.shared_dir / "history.json"
-        with open(history_file, "w") as f:
-            json.dump(history, f, indent=4)
+def calculate_round_results(team_name, initial_papers, initial_models, growth_rate):
+    """한 팀의 라운드 결과를 계산하고, (최종 점수, 상세 변화량 딕셔너리) 튜플을 반환합니다."""
+    results = calculate_all_round_results(
+        {team_name: {'papers': initial_papers, 'models': initial_models}},
+        {team_name: growth_rate},
+        teams=[team_name]
+    )
+    return results[team_name]
+
+# 이벤트 변화량 캐시 (프로세스 전체에서 공유): (game, round, team) -> (입력 키, round_event_deltas 값)
+# 입력 키 = (팀의 store 버전, 국제 이벤트 추첨 여부). 한 팀이 상태를 다시 저장하면 그 팀만 다시 계산합니다.
+# 성장률과 시작 점수는 세션마다 다르므로 키에 넣지 않고 호출마다 finish_round로 적용합니다.
+# 새 라운드를 계산해 넣을 때 그 게임의 지난 라운드 항목은 지웁니다.
+_round_results_cache = {}
+_round_results_lock = threading.Lock()
+
+def calculate_all_round_results(initial_scores, growth_rates, teams=None, game=store.DEFAULT_GAME, round=None):
+    """
+    모든 팀의 라운드 결과를 한 번에 계산합니다. 입력이 바뀐 팀만 공유 상태를 로드해 이벤트 변화량을 다시 구합니다.
+    {team: ((papers, models), details)}를 반환합니다.
+    """
+    teams = list(config.team_credentials) if teams is None else teams
+    round = store.current_round(game) if round is None else round
+    versions = store.team_versions(game, round)
+    drawn = store.draw_exists("international", game, round)
+
+    keys, deltas, stale = {}, {}, []
+    for team in teams:
+        keys[team] = (versions.get(team, 0), drawn)
+        cached = _round_results_cache.get((game, round, team))
+        if cached is not None and cached[0] == keys[team]:
+            deltas[team] = cached[1]
+        else:
+            stale.append(team)
+    instrument.count("cache.round_results.hit", len(teams) - len(stale))
+    instrument.count("cache.round_results.miss", len(stale))
+
+    if stale:
+        inputs = {team: load_round_inputs(team, game, round) for team in stale}
+        international_events = load_international_events(game, round) if drawn else None
+        fresh = round_event_deltas(inputs, international_events)
+        with _round_results_lock:
+            for key in [k for k in _round_results_cache if k[0] == game and k[1] < round]:
+                del _round_results_cache[key]
+            for team in stale:
+                _round_results_cache[(game, round, team)] = (keys[team], fresh[team])
+        deltas.update(fresh)
+    return {team: finish_team(deltas[team], initial_scores.get(team, {}), growth_rates.get(team, 0)) for team in teams}
+
+def round_event_deltas(inputs, international_events):
+    """
+    inputs: {team: (hidden, cooperation, domestic_event) 또는 None}.
+    팀별 (국내 papers, 국내 models, 국제 papers, 국제 models) 변화량 (성장률·시작 점수와 무관),
+    입력이 없거나 국제 이벤트가 아직 없으면 None.
+    국제 이벤트는 evaluate_international_batch로 (팀 × 이벤트 × 파트너)를 한 번에 평가합니다.
+    """
+    deltas = dict.fromkeys(inputs)  # 팀 순서 유지
+    ready = [team for team, data in inputs.items() if data is not None]
+    if ready and international_events is not None:
+        # hidden 파라미터 정리는 국내·국제 평가가 함께 쓰도록 팀마다 한 번만
+        hidden = {team: formulas.safe_params(inputs[team][0]) for team in ready}
+        batch = evaluate_international_batch(
+            international_events,
+            hidden,
+            {team: inputs[team][1] for team in ready},
+            teams=ready
+        )
+        # (팀, 이벤트, 파트너, [papers, models]) -> 팀별 합계
+        totals = batch.sum(axis=(1, 2))
+        for i, team in enumerate(ready):
+            domestic_event = inputs[team][2]
+            deltas[team] = (
+                *formulas.evaluate_exprs([domestic_event[f] for f in formulas.FIELDS], hidden[team]),
+                int(totals[i, 0]), int(totals[i, 1])
+            )
+    return deltas
+
+def finish_team(deltas, initial, growth_rate):
+    """round_event_deltas의 한 팀 값에 시작 점수와 성장률을 적용합니다."""
+    if deltas is None:
+        return (initial.get('papers', 0), initial.get('models', 0)), {} # 파일 없으면 빈 딕셔너리 반환
+    return finish_round(*deltas, initial.get('papers', 0), initial.get('models', 0), growth_rate)
+
+def score_all_teams(inputs, international_events, initial_scores, growth_rates):
+    """
+    inputs: {team: (hidden, cooperation, domestic_event) 또는 None}. 파일 I/O 없이 점수를 계산합니다.
+    """
+    deltas = round_event_deltas(inputs, international_events)
+    return {team: finish_team(deltas[team], initial_scores.get(team, {}), growth_rates.get(team, 0)) for team in inputs}
+
+def load_history(game=store.DEFAULT_GAME):
+    """모든 라운드 기록을 라운드 순서대로 로드합니다."""
+    return store.load_history(game)
+
+def save_history(new_round_data, game=store.DEFAULT_GAME):
+    """현재 라운드 데이터를 기록합니다. 같은 라운드 번호가 이미 있으면 무시합니다 (중복 저장 방지)."""
+    return store.save_history(new_round_data, game)
+
+def initial_scores_for(round_num, game=store.DEFAULT_GAME):
+    """라운드 시작 점수: 직전에 기록된 라운드의 점수, 기록이 없으면 config.initial_data."""
+    latest = store.latest_history(game, before_round=round_num)
+    if latest is not None:
+        return latest['scores']
+    return {name: data for name, data in config.initial_data.items()}